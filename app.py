@@ -3,14 +3,18 @@ FastAPI Application - BDD Test Generator
 Production-grade API with WebSocket support for real-time updates
 Uses LangGraph for orchestration
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, Response
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from brotli_asgi import BrotliMiddleware
+from typing import Annotated, Optional, Dict, Set
+import msgspec
 import asyncio
-from datetime import datetime
+import logging
+import time
+import orjson
+import ormsgpack
 from pathlib import Path
 from core import config, db, get_logger, LLMConfig, BrowserConfig, LLMFactory
 from orchestrator import TestGeneratorOrchestrator, set_websocket_manager
@@ -23,7 +27,8 @@ app = FastAPI(
     description="AI-Powered Gherkin Feature Generator for Hover & Popup Testing (LangGraph Edition)",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -35,32 +40,157 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Brotli for HTML/JSON responses; the download route is excluded so feature
+# files keep the plain sendfile path
+app.add_middleware(BrotliMiddleware, quality=4, excluded_handlers=["/api/download"])
+
 # Static files and templates
-app.mount("/static", StaticFiles(directory="static"), name="static")
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with long-lived Cache-Control; assets only change on deploy"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+
+
+# Optional Redis client for multi-worker fan-out; populated at startup when
+# config.REDIS_URL is set. With N uvicorn workers only the worker holding a
+# task's WebSocket can deliver updates, so send_update publishes to a
+# task:{id} channel and each connection subscribes to its own channel.
+redis_client = None
 
 
 # WebSocket connection manager
 class ConnectionManager:
+    """Manages WebSocket connections, sending updates as MessagePack binary frames
+
+    Messages follow the schema {type, task_id, status, progress, current_step, result}
+    and are packed with ormsgpack before going on the wire. Clients can opt back
+    into JSON frames with a ?format=json query param for browser debugging.
+
+    Updates are coalesced per task: send_update enqueues onto an asyncio.Queue
+    and a background sender drains the queue, shipping everything that
+    accumulated within the flush window as a single batched frame.
+    """
+
+    # How long the sender waits for more messages before flushing a batch
+    FLUSH_INTERVAL = 0.01
+
+    # How long a get_status reply stays fresh before the DB is requeried
+    STATUS_TTL = 0.1
+
     def __init__(self):
         self.active_connections: Dict[int, WebSocket] = {}
+        self.json_mode: Dict[int, bool] = {}
+        self.queues: Dict[int, asyncio.Queue] = {}
+        self.senders: Dict[int, asyncio.Task] = {}
+        self.subscribers: Dict[int, asyncio.Task] = {}
+        self.last_status: Dict[int, tuple] = {}
+
+    def get_cached_status(self, task_id: int) -> Optional[dict]:
+        """Return the last status message if it is still within STATUS_TTL"""
+        cached = self.last_status.get(task_id)
+        if cached and time.monotonic() - cached[0] < self.STATUS_TTL:
+            return cached[1]
+        return None
+
+    def cache_status(self, task_id: int, message: dict):
+        self.last_status[task_id] = (time.monotonic(), message)
 
     async def connect(self, task_id: int, websocket: WebSocket):
         await websocket.accept()
         self.active_connections[task_id] = websocket
-        logger.info(f"WebSocket connected for task {task_id}")
+        self.json_mode[task_id] = websocket.query_params.get("format") == "json"
+        self.queues[task_id] = asyncio.Queue()
+        self.senders[task_id] = asyncio.create_task(self._sender(task_id))
+        if redis_client is not None:
+            self.subscribers[task_id] = asyncio.create_task(self._subscriber(task_id))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("WebSocket connected for task %d", task_id)
 
     def disconnect(self, task_id: int):
         if task_id in self.active_connections:
             del self.active_connections[task_id]
-            logger.info(f"WebSocket disconnected for task {task_id}")
+            self.json_mode.pop(task_id, None)
+            sender = self.senders.pop(task_id, None)
+            if sender:
+                sender.cancel()
+            subscriber = self.subscribers.pop(task_id, None)
+            if subscriber:
+                subscriber.cancel()
+            self.queues.pop(task_id, None)
+            self.last_status.pop(task_id, None)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("WebSocket disconnected for task %d", task_id)
+
+    def uses_json(self, task_id: int) -> bool:
+        return self.json_mode.get(task_id, False)
 
     async def send_update(self, task_id: int, message: dict):
-        if task_id in self.active_connections:
-            try:
-                await self.active_connections[task_id].send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending WebSocket update: {str(e)}")
-                self.disconnect(task_id)
+        # With Redis configured, publish so whichever worker holds the
+        # WebSocket delivers the update
+        if redis_client is not None:
+            await redis_client.publish(f"task:{task_id}", ormsgpack.packb(message))
+            return
+        # Single .get() instead of a membership test plus an indexing lookup;
+        # this runs for every progress update a task emits
+        queue = self.queues.get(task_id)
+        if queue is not None:
+            queue.put_nowait(message)
+
+    async def _subscriber(self, task_id: int):
+        """Forward updates published on this task's channel into the local queue"""
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(f"task:{task_id}")
+        try:
+            async for entry in pubsub.listen():
+                if entry["type"] != "message":
+                    continue
+                queue = self.queues.get(task_id)
+                if queue is not None:
+                    queue.put_nowait(ormsgpack.unpackb(entry["data"]))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await pubsub.unsubscribe(f"task:{task_id}")
+            await pubsub.close()
+
+    async def _sender(self, task_id: int):
+        """Background coroutine draining queued updates into batched frames"""
+        queue = self.queues[task_id]
+        try:
+            while True:
+                batch = [await queue.get()]
+
+                # Give the orchestrator a short window to emit more updates,
+                # then drain whatever accumulated into the same frame
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+                while True:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+
+                await self._send_batch(task_id, batch)
+        except asyncio.CancelledError:
+            pass
+
+    async def _send_batch(self, task_id: int, batch: list):
+        websocket = self.active_connections.get(task_id)
+        if not websocket:
+            return
+        try:
+            if self.uses_json(task_id):
+                await websocket.send_json(batch)
+            else:
+                await websocket.send_bytes(ormsgpack.packb(batch))
+        except Exception as e:
+            logger.error("Error sending WebSocket update: %s", e)
+            self.disconnect(task_id)
 
 
 manager = ConnectionManager()
@@ -69,153 +199,167 @@ manager = ConnectionManager()
 set_websocket_manager(manager)
 
 
-# Pydantic models
-class GenerateRequest(BaseModel):
-    url: str = Field(..., description="Website URL to analyze")
-    llm_provider: str = Field(default="groq", description="LLM provider")
-    llm_model: Optional[str] = Field(None, description="LLM model name")
-    headless: bool = Field(default=True, description="Run browser in headless mode")
-    temperature: float = Field(default=0.3, ge=0.0, le=2.0)
-    max_tokens: int = Field(default=4096, ge=100, le=32000)
-    timeout: int = Field(default=30000, ge=5000, le=120000)
-    slow_mo: int = Field(default=100, ge=0, le=1000)
+# Request/response schemas (msgspec Structs validate in C, skipping the
+# per-field pydantic validator overhead on the POST hot path)
+class GenerateRequest(msgspec.Struct):
+    url: str  # Website URL to analyze
+    llm_provider: str = "groq"
+    llm_model: Optional[str] = None
+    headless: bool = True
+    temperature: Annotated[float, msgspec.Meta(ge=0.0, le=2.0)] = 0.3
+    max_tokens: Annotated[int, msgspec.Meta(ge=100, le=32000)] = 4096
+    timeout: Annotated[int, msgspec.Meta(ge=5000, le=120000)] = 30000
+    slow_mo: Annotated[int, msgspec.Meta(ge=0, le=1000)] = 100
 
 
-class TaskResponse(BaseModel):
+class TaskResponse(msgspec.Struct):
     status: str
     task_id: int
     message: str
 
 
+_generate_decoder = msgspec.json.Decoder(GenerateRequest)
+
+
 # Store active background tasks
-active_tasks: Dict[int, asyncio.Task] = {}
+active_tasks: Set[asyncio.Task] = set()
+
+# Bound how many generation workflows run at once; excess tasks queue on the
+# semaphore instead of piling browser sessions onto the event loop
+_task_sem = asyncio.Semaphore(config.MAX_CONCURRENT_TASKS)
 
 
 # Background task for test generation using LangGraph
 async def run_test_generation(task_id: int, url: str, llm_config: LLMConfig, browser_config: BrowserConfig):
     """Run test generation in background with LangGraph orchestration"""
-    try:
-        logger.info(f"Starting LangGraph-based generation for task {task_id}")
+    send_update = manager.send_update  # Bind once for the task's update stream
 
-        orchestrator = TestGeneratorOrchestrator(llm_config, browser_config)
-        orchestrator.task_id = task_id
+    async with _task_sem:
+        try:
+            logger.info("Starting LangGraph-based generation for task %d", task_id)
 
-        # Send initial update
-        await manager.send_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 0,
-            'current_step': 'Initializing LangGraph workflow...'
-        })
+            # Send initial update
+            await send_update(task_id, {
+                'type': 'status',
+                'task_id': task_id,
+                'status': 'running',
+                'progress': 0,
+                'current_step': 'Initializing LangGraph workflow...'
+            })
 
-        # Run generation via LangGraph workflow
-        result = await orchestrator.generate_tests(url)
+            # Run generation via the shared LangGraph workflow
+            result = await app.state.orchestrator.generate_tests(url, llm_config, browser_config)
 
-        # Send completion update
-        await manager.send_update(task_id, {
-            'type': 'complete',
-            'task_id': task_id,
-            'status': 'completed',
-            'progress': 100,
-            'result': result
-        })
+            # Send completion update
+            await send_update(task_id, {
+                'type': 'complete',
+                'task_id': task_id,
+                'status': 'completed',
+                'progress': 100,
+                'result': result
+            })
 
-        logger.info(f"Completed LangGraph generation for task {task_id}")
+            logger.info("Completed LangGraph generation for task %d", task_id)
 
-    except Exception as e:
-        error_msg = f"LangGraph generation error for task {task_id}: {str(e)}"
-        logger.error(error_msg)
+        except Exception as e:
+            error_msg = f"LangGraph generation error for task {task_id}: {str(e)}"
+            logger.error(error_msg)
 
-        # Send error update
-        await manager.send_update(task_id, {
-            'type': 'error',
-            'task_id': task_id,
-            'status': 'failed',
-            'error': str(e)
-        })
-    finally:
-        if task_id in active_tasks:
-            del active_tasks[task_id]
+            # Send error update
+            await send_update(task_id, {
+                'type': 'error',
+                'task_id': task_id,
+                'status': 'failed',
+                'error': str(e)
+            })
+
+
+# Index template, read once at startup; it never changes at runtime
+_INDEX_HTML: bytes = b""
 
 
 # Routes
 @app.get("/", response_class=HTMLResponse)
 async def index():
     """Main page"""
-    with open("templates/index.html", "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=_INDEX_HTML)
+
+
+def _build_config_bytes() -> bytes:
+    """Serialize the static /api/config payload once; it never changes after startup"""
+    return orjson.dumps({
+        'status': 'success',
+        'providers': LLMFactory.get_available_providers(),
+        'models': config.MODELS,
+        'default_provider': config.DEFAULT_LLM_PROVIDER,
+        'browser_settings': {
+            'headless': True,
+            'timeout': 30000,
+            'viewport_width': 1920,
+            'viewport_height': 1080
+        },
+        'orchestrator': 'LangGraph'  # Indicate we're using LangGraph
+    })
 
 
 @app.get("/api/config")
 async def get_config():
     """Get current configuration"""
-    try:
-        available_providers = LLMFactory.get_available_providers()
-
-        return {
-            'status': 'success',
-            'providers': available_providers,
-            'models': config.MODELS,
-            'default_provider': config.DEFAULT_LLM_PROVIDER,
-            'browser_settings': {
-                'headless': True,
-                'timeout': 30000,
-                'viewport_width': 1920,
-                'viewport_height': 1080
-            },
-            'orchestrator': 'LangGraph'  # Indicate we're using LangGraph
-        }
-    except Exception as e:
-        logger.error(f"Error getting config: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=app.state.config_bytes, media_type="application/json")
 
 
-@app.post("/api/generate", response_model=TaskResponse)
-async def generate_tests(request: GenerateRequest, background_tasks: BackgroundTasks):
+@app.post("/api/generate")
+async def generate_tests(request: Request, background_tasks: BackgroundTasks):
     """Start test generation using LangGraph workflow"""
     try:
-        # Validate URL
-        url = request.url.strip()
-        if not url.startswith('http'):
-            url = 'https://' + url
+        req = _generate_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        # DecodeError covers malformed JSON as well as its ValidationError
+        # subclass, so both surface as 422 like pydantic did
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        # Validate URL; the tuple form rejects malformed schemes like httpx://
+        url = req.url.strip()
+        url = url if url.startswith(("http://", "https://")) else f"https://{url}"
 
         # Get LLM configuration
-        llm_model = request.llm_model or config.MODELS.get(request.llm_provider, [])[0]
+        llm_model = req.llm_model or config.MODELS.get(req.llm_provider, [])[0]
 
         llm_config = LLMConfig(
-            provider=request.llm_provider,
+            provider=req.llm_provider,
             model=llm_model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
+            temperature=req.temperature,
+            max_tokens=req.max_tokens
         )
 
         # Get browser configuration
         browser_config = BrowserConfig(
-            headless=request.headless,
-            timeout=request.timeout,
-            slow_mo=request.slow_mo
+            headless=req.headless,
+            timeout=req.timeout,
+            slow_mo=req.slow_mo
         )
 
         # Create task
-        task_id = db.create_task(url, llm_config.provider, llm_config.model)
+        task_id = await asyncio.to_thread(db.create_task, url, llm_config.provider, llm_config.model)
 
         # Start background task with LangGraph orchestration
         task = asyncio.create_task(
             run_test_generation(task_id, url, llm_config, browser_config)
         )
-        active_tasks[task_id] = task
+        active_tasks.add(task)
+        task.add_done_callback(active_tasks.discard)
 
-        logger.info(f"Started LangGraph test generation task {task_id} for {url}")
+        logger.info("Started LangGraph test generation task %d for %s", task_id, url)
 
-        return TaskResponse(
+        return ORJSONResponse(msgspec.to_builtins(TaskResponse(
             status='success',
             task_id=task_id,
             message='Test generation started (LangGraph)'
-        )
+        )))
 
     except Exception as e:
-        logger.error(f"Error starting generation: {str(e)}")
+        logger.error("Error starting generation: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -223,7 +367,7 @@ async def generate_tests(request: GenerateRequest, background_tasks: BackgroundT
 async def get_task_status(task_id: int):
     """Get task status"""
     try:
-        task = db.get_task(task_id)
+        task = await asyncio.to_thread(db.get_task, task_id)
 
         if not task:
             raise HTTPException(status_code=404, detail='Task not found')
@@ -231,7 +375,7 @@ async def get_task_status(task_id: int):
         # Get features if completed
         features = []
         if task['status'] == 'completed':
-            features = db.get_task_features(task_id)
+            features = await asyncio.to_thread(db.get_task_features, task_id)
 
         return {
             'status': 'success',
@@ -254,7 +398,7 @@ async def get_task_status(task_id: int):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting task status: {str(e)}")
+        logger.error("Error getting task status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -262,7 +406,7 @@ async def get_task_status(task_id: int):
 async def get_all_tasks(limit: int = 50):
     """Get all tasks"""
     try:
-        tasks = db.get_all_tasks(limit)
+        tasks = await asyncio.to_thread(db.get_all_tasks, limit)
 
         return {
             'status': 'success',
@@ -270,7 +414,7 @@ async def get_all_tasks(limit: int = 50):
         }
 
     except Exception as e:
-        logger.error(f"Error getting tasks: {str(e)}")
+        logger.error("Error getting tasks: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -278,7 +422,7 @@ async def get_all_tasks(limit: int = 50):
 async def get_task_logs(task_id: int):
     """Get task logs"""
     try:
-        logs = db.get_task_logs(task_id)
+        logs = await asyncio.to_thread(db.get_task_logs, task_id)
 
         return {
             'status': 'success',
@@ -286,7 +430,7 @@ async def get_task_logs(task_id: int):
         }
 
     except Exception as e:
-        logger.error(f"Error getting task logs: {str(e)}")
+        logger.error("Error getting task logs: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -294,13 +438,13 @@ async def get_task_logs(task_id: int):
 async def get_workflow_info(task_id: int):
     """Get LangGraph workflow information for a task"""
     try:
-        task = db.get_task(task_id)
+        task = await asyncio.to_thread(db.get_task, task_id)
 
         if not task:
             raise HTTPException(status_code=404, detail='Task not found')
 
         # Get workflow nodes that were executed
-        logs = db.get_task_logs(task_id)
+        logs = await asyncio.to_thread(db.get_task_logs, task_id)
 
         workflow_steps = [
             {"name": "create_task", "status": "completed" if task['task_id'] else "pending"},
@@ -310,17 +454,23 @@ async def get_workflow_info(task_id: int):
             {"name": "complete_task", "status": task['status']}
         ]
 
-        # Infer step statuses from logs
+        # Infer step statuses from logs in a single pass; both element markers
+        # map to the browser_analysis step
+        markers = {
+            'hover elements': 1,
+            'popup elements': 1,
+            'hover features': 2,
+            'popup features': 3
+        }
+        pending = set(markers)
         for log in logs:
+            if not pending:
+                break
             msg = log['message'].lower()
-            if 'hover elements' in msg:
-                workflow_steps[1]['status'] = 'completed'
-            if 'popup elements' in msg:
-                workflow_steps[1]['status'] = 'completed'
-            if 'hover features' in msg:
-                workflow_steps[2]['status'] = 'completed'
-            if 'popup features' in msg:
-                workflow_steps[3]['status'] = 'completed'
+            for marker in list(pending):
+                if marker in msg:
+                    workflow_steps[markers[marker]]['status'] = 'completed'
+                    pending.discard(marker)
 
         return {
             'status': 'success',
@@ -332,7 +482,7 @@ async def get_workflow_info(task_id: int):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting workflow info: {str(e)}")
+        logger.error("Error getting workflow info: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -340,40 +490,59 @@ async def get_workflow_info(task_id: int):
 async def download_feature(task_id: int, feature_type: str):
     """Download generated feature file"""
     try:
-        features = db.get_task_features(task_id)
-
-        feature = next((f for f in features if f['feature_type'] == feature_type), None)
+        feature = await asyncio.to_thread(db.get_task_feature, task_id, feature_type)
 
         if not feature or not feature['file_path']:
             raise HTTPException(status_code=404, detail='Feature file not found')
 
         file_path = Path(feature['file_path'])
 
-        if not file_path.exists():
+        # Stat once: doubles as the existence check and lets FileResponse set
+        # Content-Length up front, keeping the kernel sendfile path eligible
+        try:
+            stat_result = file_path.stat()
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail='File does not exist')
 
         return FileResponse(
             path=file_path,
-            media_type='text/plain',
-            filename=file_path.name
+            media_type='text/plain; charset=utf-8',
+            filename=file_path.name,
+            stat_result=stat_result
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error downloading feature: {str(e)}")
+        logger.error("Error downloading feature: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Health-check timestamp, refreshed once per second by a background ticker so
+# aggressive load-balancer polling doesn't allocate a datetime per request
+_NOW_ISO = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+async def _tick():
+    """Refresh the cached health-check timestamp every second"""
+    global _NOW_ISO
+    while True:
+        _NOW_ISO = time.strftime('%Y-%m-%dT%H:%M:%S')
+        await asyncio.sleep(1)
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'active_tasks': len(active_tasks),
-        'orchestrator': 'LangGraph'
-    }
+    return Response(
+        content=orjson.dumps({
+            'status': 'healthy',
+            'timestamp': _NOW_ISO,
+            'active_tasks': len(active_tasks),
+            'orchestrator': 'LangGraph'
+        }),
+        media_type="application/json"
+    )
 
 
 @app.websocket("/ws/{task_id}")
@@ -383,26 +552,55 @@ async def websocket_endpoint(websocket: WebSocket, task_id: int):
     try:
         while True:
             # Keep connection alive and listen for client messages
-            data = await websocket.receive_text()
+            if manager.uses_json(task_id):
+                data = await websocket.receive_text()
+            else:
+                data = ormsgpack.unpackb(await websocket.receive_bytes())
 
-            # Client can request current status
+            # Client can request current status; aggressive pollers get the
+            # cached reply instead of a DB round-trip per message
             if data == "get_status":
-                task = db.get_task(task_id)
-                if task:
-                    await websocket.send_json({
+                message = manager.get_cached_status(task_id)
+                if message is None:
+                    task = await asyncio.to_thread(db.get_task, task_id)
+                    if not task:
+                        continue
+                    message = {
                         'type': 'status',
                         'task_id': task_id,
                         'status': task['status'],
                         'progress': task['progress'],
                         'current_step': task['current_step']
-                    })
+                    }
+                    manager.cache_status(task_id, message)
+                await manager.send_update(task_id, message)
     except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("WebSocket error for task %d: %s", task_id, e)
+    finally:
+        # Always release the sender task, queue and dict entries, even when
+        # the loop dies on something other than a clean disconnect
         manager.disconnect(task_id)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Application startup"""
+    global _INDEX_HTML, redis_client
+    _INDEX_HTML = Path("templates/index.html").read_bytes()
+
+    if config.REDIS_URL:
+        import redis.asyncio as aioredis
+        redis_client = aioredis.from_url(config.REDIS_URL)
+        logger.info("Redis fan-out enabled: %s", config.REDIS_URL)
+    app.state.config_bytes = _build_config_bytes()
+    app.state.clock_task = asyncio.create_task(_tick())
+
+    # Compile the LangGraph workflow once; tasks share the orchestrator and
+    # pass their own configs through generate_tests
+    app.state.orchestrator = TestGeneratorOrchestrator.build_shared()
+
     logger.info("=" * 60)
     logger.info("BDD Test Generator - LangGraph Edition")
     logger.info("=" * 60)
@@ -418,13 +616,18 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown"""
     logger.info("Shutting down BDD Test Generator...")
-    # Cancel all active tasks
-    for task_id, task in active_tasks.items():
+    # Cancel all active tasks over a snapshot; each task's done-callback
+    # mutates active_tasks, so iterating the live set would race
+    tasks = list(active_tasks)
+    for task in tasks:
         task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
     logger.info("Shutdown complete")
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
 
     uvicorn.run(
@@ -432,5 +635,10 @@ if __name__ == "__main__":
         host=config.HOST,
         port=config.PORT,
         reload=config.DEBUG,
-        log_level=config.LOG_LEVEL.lower()
+        log_level=config.LOG_LEVEL.lower(),
+        # uvloop + httptools are C implementations of the event loop and HTTP
+        # parser; uvloop is unavailable on Windows (start.bat), so fall back
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        ws="websockets"
     )
\ No newline at end of file
@@ -3,21 +3,355 @@ Browser Automation Module - 100% Dynamic Implementation
 Uses Playwright for fully autonomous webpage analysis without hardcoded selectors
 """
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from playwright.async_api import async_playwright, Page, Browser, ElementHandle
-from bs4 import BeautifulSoup
-import json
+from typing import List, Dict, Any, Optional, Union
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from .config import config, BrowserConfig
 from .logger import get_logger
 
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 logger = get_logger(__name__)
 
+# Mutation-gated wait: resolves on the first DOM change under body, with the
+# given milliseconds as the fallback ceiling
+_GWAIT_JS = """
+(ms) => new Promise(res => {
+    const mo = new MutationObserver(() => { mo.disconnect(); res(true); });
+    mo.observe(document.body, {childList: true, subtree: true, attributes: true});
+    setTimeout(() => { mo.disconnect(); res(false); }, ms);
+})
+"""
+
+# Fully dynamic hover detection, installed once per context so each
+# analysis call ships a ~40-byte stub instead of the full source
+_HOVER_DETECT_JS = """
+window.__detectHover = () => {
+    const hoverableElements = [];
+    const seenElements = new Set();
+
+    // :hover selectors come from the per-page cache primed after
+    // navigation; rebuild lazily if the cache is missing
+    let cache = window.__gherkinCache;
+    if (!cache || !cache.hoverSelectors) {
+        const hoverSelectors = [];
+        const sheets = document.styleSheets;
+        for (let i = 0; i < sheets.length; i++) {
+            try {
+                const rules = sheets[i].cssRules || sheets[i].rules;
+                if (!rules) continue;
+                for (let j = 0; j < rules.length; j++) {
+                    const rule = rules[j];
+                    if (rule.selectorText && rule.selectorText.indexOf(':hover') !== -1) {
+                        const sel = rule.selectorText.replace(/:hover/g, '').trim();
+                        if (sel) hoverSelectors.push(sel);
+                    }
+                }
+            } catch (e) {
+                // Skip CORS-protected stylesheets
+            }
+        }
+        cache = window.__gherkinCache = {hoverSelectors: hoverSelectors};
+    }
+    const hoverSelectors = cache.hoverSelectors;
+
+    // Helper: Generate a CSS path for element. Walks element
+    // siblings only and stops at <body>, and the result resolves
+    // via querySelector instead of the slower XPath evaluator
+    function cssPath(element) {
+        if (element.id) {
+            return '#' + CSS.escape(element.id);
+        }
+
+        const parts = [];
+        let current = element;
+
+        while (current && current !== document.body &&
+               current.nodeType === Node.ELEMENT_NODE) {
+            let index = 1;
+            let sibling = current.previousElementSibling;
+
+            while (sibling) {
+                if (sibling.tagName === current.tagName) index++;
+                sibling = sibling.previousElementSibling;
+            }
+
+            parts.unshift(current.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+            current = current.parentElement;
+        }
+
+        return 'body > ' + parts.join(' > ');
+    }
+    
+    // Helper: Detect hover behavior (cs = precomputed style)
+    function hasHoverBehavior(element, cs) {
+        // Check cursor
+        if (cs.cursor === 'pointer') return true;
+
+        // Check hover-related attributes
+        if (element.hasAttribute('onmouseover') ||
+            element.hasAttribute('onmouseenter') ||
+            element.hasAttribute('onmouseleave')) return true;
+
+        // Check against the precomputed :hover rule selectors
+        for (const sel of hoverSelectors) {
+            try {
+                if (element.matches(sel)) return true;
+            } catch (e) {
+                // Skip selectors matches() cannot parse
+            }
+        }
+
+        // Check parent elements for dropdown/menu containers
+        let parent = element.parentElement;
+        let depth = 0;
+        while (parent && depth < 3) {
+            const parentStyle = window.getComputedStyle(parent);
+            if (parentStyle.position === 'relative' ||
+                parentStyle.position === 'absolute') {
+                // Check for hidden children that might appear on hover
+                const children = parent.children;
+                for (let i = 0; i < children.length; i++) {
+                    const childStyle = window.getComputedStyle(children[i]);
+                    if (childStyle.display === 'none' || 
+                        childStyle.visibility === 'hidden' ||
+                        childStyle.opacity === '0') {
+                        return true;
+                    }
+                }
+            }
+            parent = parent.parentElement;
+            depth++;
+        }
+        
+        return false;
+    }
+    
+    // Walk the element tree, rejecting non-content tags before
+    // any style/bounds work instead of materializing '*'
+    const walker = document.createTreeWalker(
+        document.body,
+        NodeFilter.SHOW_ELEMENT,
+        {
+            acceptNode(el) {
+                const tag = el.tagName;
+                if (tag === 'SCRIPT' || tag === 'STYLE' ||
+                    tag === 'META' || tag === 'LINK' ||
+                    tag === 'NOSCRIPT' || tag === 'TEMPLATE') {
+                    return NodeFilter.FILTER_REJECT;
+                }
+                return NodeFilter.FILTER_ACCEPT;
+            }
+        }
+    );
+
+    for (let element = walker.nextNode(); element; element = walker.nextNode()) {
+        try {
+            const rect = element.getBoundingClientRect();
+            if (rect.width <= 0 || rect.height <= 0) continue;
+
+            // Skip elements far outside the scroll window; they
+            // are not realistic interaction targets
+            if (rect.top > window.innerHeight * 3 ||
+                rect.bottom < -window.innerHeight) continue;
+
+            const tagName = element.tagName.toLowerCase();
+            const text = element.innerText?.trim() ||
+                        element.textContent?.trim() ||
+                        element.getAttribute('aria-label') ||
+                        element.getAttribute('title') || '';
+
+            // Skip if no meaningful content
+            if (!text && tagName !== 'img' && tagName !== 'svg') continue;
+
+            // Skip very long text (likely not a hover target)
+            if (text.length > 200) continue;
+
+            // Compute style once, only for surviving elements
+            const cs = window.getComputedStyle(element);
+            if (cs.display === 'none' ||
+                cs.visibility === 'hidden' ||
+                cs.opacity === '0') continue;
+
+            // Check if element or its interactive parent has hover behavior
+            const isInteractive = hasHoverBehavior(element, cs);
+
+            if (isInteractive) {
+                const selector = cssPath(element);
+
+                // Avoid duplicates
+                if (seenElements.has(selector)) continue;
+                seenElements.add(selector);
+
+                hoverableElements.push({
+                    tag: tagName,
+                    text: text.substring(0, 100),
+                    selector: selector,
+                    class: element.className,
+                    id: element.id || null,
+                    href: element.href || null,
+                    role: element.getAttribute('role') || null,
+                    ariaLabel: element.getAttribute('aria-label') || null,
+                    position: {
+                        x: Math.round(rect.x),
+                        y: Math.round(rect.y),
+                        width: Math.round(rect.width),
+                        height: Math.round(rect.height)
+                    }
+                });
+            }
+        } catch (e) {
+            // Skip problematic elements
+        }
+    }
+
+    return hoverableElements.slice(0, 50);
+};
+"""
+
+# Fully dynamic popup-trigger detection, installed alongside the hover
+# detector
+_POPUP_DETECT_JS = """
+window.__detectPopup = () => {
+    const popupTriggers = [];
+    const seenElements = new Set();
+
+    // Precompiled keyword alternations; one regex scan per
+    // string instead of a substring search per keyword
+    const dataRE = /modal|popup|dialog|overlay|toggle|open|show|trigger/;
+    const textRE = /\\b(learn more|sign up|login|subscribe|register|join|get started|more info|details|view|show|open)\\b/i;
+
+    function cssPath(element) {
+        if (element.id) return '#' + CSS.escape(element.id);
+        const parts = [];
+        let current = element;
+        while (current && current !== document.body &&
+               current.nodeType === Node.ELEMENT_NODE) {
+            let index = 1;
+            let sibling = current.previousElementSibling;
+            while (sibling) {
+                if (sibling.tagName === current.tagName) index++;
+                sibling = sibling.previousElementSibling;
+            }
+            parts.unshift(current.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+            current = current.parentElement;
+        }
+        return 'body > ' + parts.join(' > ');
+    }
+    
+    function isVisible(element) {
+        const rect = element.getBoundingClientRect();
+        if (rect.width <= 0 || rect.height <= 0) return false;
+        // Skip elements far outside the scroll window
+        if (rect.top > window.innerHeight * 3 ||
+            rect.bottom < -window.innerHeight) return false;
+        const cs = window.getComputedStyle(element);
+        return cs.display !== 'none' &&
+               cs.visibility !== 'hidden';
+    }
+    
+    function mightTriggerPopup(element) {
+        // Check onclick attribute
+        if (element.hasAttribute('onclick')) return true;
+
+        // Check data attributes suggesting modals (attribute
+        // names are already lowercase in HTML documents)
+        const attrs = element.attributes;
+        for (let k = 0; k < attrs.length; k++) {
+            const n = attrs[k].name;
+            if (n.charCodeAt(0) === 100 /* 'd' */ &&
+                n.startsWith('data-') && dataRE.test(n)) {
+                return true;
+            }
+        }
+
+        // Check aria attributes
+        const ariaExpanded = element.getAttribute('aria-expanded');
+        const ariaHaspopup = element.getAttribute('aria-haspopup');
+        if (ariaExpanded || ariaHaspopup) return true;
+
+        // Check button text for modal keywords
+        const text = element.innerText || element.textContent || '';
+        return textRE.test(text);
+    }
+    
+    // Scan for clickable elements
+    const clickables = document.querySelectorAll('button, a, [onclick], [role="button"]');
+    
+    clickables.forEach(element => {
+        try {
+            if (!isVisible(element)) return;
+            
+            const text = element.innerText?.trim() || 
+                        element.textContent?.trim() || '';
+            
+            if (!text || text.length > 100) return;
+            
+            if (mightTriggerPopup(element)) {
+                const selector = cssPath(element);
+                if (seenElements.has(selector)) return;
+                seenElements.add(selector);
+
+                const rect = element.getBoundingClientRect();
+
+                popupTriggers.push({
+                    tag: element.tagName.toLowerCase(),
+                    text: text.substring(0, 100),
+                    selector: selector,
+                    class: element.className,
+                    id: element.id || null,
+                    onclick: element.getAttribute('onclick') || null,
+                    dataAttrs: Array.from(element.attributes)
+                        .filter(a => a.name.startsWith('data-'))
+                        .map(a => ({name: a.name, value: a.value})),
+                    ariaHaspopup: element.getAttribute('aria-haspopup'),
+                    position: {
+                        x: Math.round(rect.x),
+                        y: Math.round(rect.y)
+                    }
+                });
+            }
+        } catch (e) {}
+    });
+    
+    return popupTriggers.slice(0, 30);
+};
+"""
+
+# Derived per-page data shared by the analysis passes. Stored on window so a
+# navigation (which resets window) invalidates it automatically.
+_PAGE_CACHE_JS = """
+() => {
+    if (window.__gherkinCache) return;
+
+    const hoverSelectors = [];
+    for (const sheet of document.styleSheets) {
+        try {
+            for (const rule of sheet.cssRules || sheet.rules || []) {
+                if (rule.selectorText && rule.selectorText.indexOf(':hover') !== -1) {
+                    const sel = rule.selectorText.replace(/:hover/g, '').trim();
+                    if (sel) hoverSelectors.push(sel);
+                }
+            }
+        } catch (e) {
+            // Skip CORS-protected stylesheets
+        }
+    }
+
+    window.__gherkinCache = {hoverSelectors: hoverSelectors};
+}
+"""
+
 class BrowserAutomation:
     """Handles browser automation for fully dynamic webpage analysis"""
 
     def __init__(self, browser_config: Optional[BrowserConfig] = None):
         self.config = browser_config or BrowserConfig()
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.playwright = None
 
@@ -39,15 +373,9 @@ class BrowserAutomation:
                 slow_mo=self.config.slow_mo
             )
 
-            context = await self.browser.new_context(
-                viewport={
-                    'width': self.config.viewport_width,
-                    'height': self.config.viewport_height
-                },
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
+            self.context = await self._new_context()
 
-            self.page = await context.new_page()
+            self.page = await self.context.new_page()
             self.page.set_default_timeout(self.config.timeout)
 
             logger.info("Browser initialized successfully")
@@ -55,11 +383,47 @@ class BrowserAutomation:
             logger.error(f"Failed to initialize browser: {str(e)}")
             raise
 
+    async def _new_context(self):
+        """Create a browser context with the standard viewport and user agent"""
+        context = await self.browser.new_context(
+            viewport={
+                'width': self.config.viewport_width,
+                'height': self.config.viewport_height
+            },
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        )
+
+        # Install the detectors up front; V8 compiles them once per page and
+        # the analysis calls then ship only tiny stub invocations
+        await context.add_init_script(_HOVER_DETECT_JS + '\n' + _POPUP_DETECT_JS)
+
+        # DOM analysis does not need images/fonts/media; aborting them cuts
+        # page-load time and bandwidth without affecting the probes
+        if self.config.block_resources:
+            blocked = frozenset(self.config.block_resources)
+            await context.route(
+                '**/*',
+                lambda route: route.abort()
+                if route.request.resource_type in blocked
+                else route.continue_()
+            )
+
+        return context
+
+    async def reset_page(self):
+        """Open a fresh page on the warm context without relaunching Chromium"""
+        if self.page:
+            await self.page.close()
+        self.page = await self.context.new_page()
+        self.page.set_default_timeout(self.config.timeout)
+
     async def close(self):
         """Close browser"""
         try:
             if self.page:
                 await self.page.close()
+            if self.context:
+                await self.context.close()
             if self.browser:
                 await self.browser.close()
             if self.playwright:
@@ -72,14 +436,28 @@ class BrowserAutomation:
         """Navigate to URL"""
         try:
             logger.info(f"Navigating to: {url}")
-            await self.page.goto(url, wait_until='networkidle')
-            await asyncio.sleep(2)  # Wait for dynamic content
+            # domcontentloaded + a mutation-gated settle beats networkidle,
+            # which can stall for tens of seconds on analytics-heavy sites
+            await self.page.goto(url, wait_until='domcontentloaded')
+            await self.page.evaluate(_GWAIT_JS, 2000)
+            await self._precompute_page_caches()
             logger.info(f"Successfully loaded: {url}")
             return True
         except Exception as e:
             logger.error(f"Failed to navigate to {url}: {str(e)}")
             return False
 
+    async def _precompute_page_caches(self):
+        """
+        Prime window.__gherkinCache with derived page data shared by the
+        analysis passes. Navigation resets window, so the cache can never
+        go stale across pages.
+        """
+        try:
+            await self.page.evaluate(_PAGE_CACHE_JS)
+        except Exception as e:
+            logger.warning(f"Could not precompute page caches: {str(e)}")
+
     async def analyze_hover_elements(self) -> List[Dict[str, Any]]:
         """
         Analyze elements that respond to hover - FULLY DYNAMIC
@@ -88,276 +466,195 @@ class BrowserAutomation:
         try:
             logger.info("Analyzing hover elements dynamically...")
 
-            # JavaScript for 100% dynamic hover detection
-            dynamic_hover_detection = """
-            () => {
-                const hoverableElements = [];
-                const seenElements = new Set();
-                
-                // Helper: Generate XPath for element
-                function getXPath(element) {
-                    if (element.id) {
-                        return `//*[@id="${element.id}"]`;
-                    }
-                    
-                    const parts = [];
-                    let current = element;
-                    
-                    while (current && current.nodeType === Node.ELEMENT_NODE) {
-                        let index = 0;
-                        let sibling = current.previousSibling;
-                        
-                        while (sibling) {
-                            if (sibling.nodeType === Node.ELEMENT_NODE && 
-                                sibling.nodeName === current.nodeName) {
-                                index++;
-                            }
-                            sibling = sibling.previousSibling;
-                        }
-                        
-                        const tagName = current.nodeName.toLowerCase();
-                        const pathIndex = index > 0 ? `[${index + 1}]` : '';
-                        parts.unshift(tagName + pathIndex);
-                        current = current.parentNode;
-                    }
-                    
-                    return '/' + parts.join('/');
-                }
-                
-                // Helper: Check if element is visible
-                function isVisible(element) {
-                    const rect = element.getBoundingClientRect();
-                    const style = window.getComputedStyle(element);
-                    
-                    return rect.width > 0 && 
-                           rect.height > 0 && 
-                           style.display !== 'none' && 
-                           style.visibility !== 'hidden' &&
-                           style.opacity !== '0';
-                }
-                
-                // Helper: Detect hover behavior
-                function hasHoverBehavior(element) {
-                    const computed = window.getComputedStyle(element);
-                    
-                    // Check cursor
-                    if (computed.cursor === 'pointer') return true;
-                    
-                    // Check hover-related attributes
-                    if (element.hasAttribute('onmouseover') || 
-                        element.hasAttribute('onmouseenter') ||
-                        element.hasAttribute('onmouseleave')) return true;
-                    
-                    // Check if element has hover CSS rules
-                    try {
-                        const sheets = Array.from(document.styleSheets);
-                        for (const sheet of sheets) {
-                            try {
-                                const rules = Array.from(sheet.cssRules || sheet.rules || []);
-                                for (const rule of rules) {
-                                    if (rule.selectorText && rule.selectorText.includes(':hover')) {
-                                        if (element.matches(rule.selectorText.replace(':hover', ''))) {
-                                            return true;
-                                        }
-                                    }
-                                }
-                            } catch (e) {
-                                // Skip CORS-protected stylesheets
-                            }
-                        }
-                    } catch (e) {}
-                    
-                    // Check parent elements for dropdown/menu containers
-                    let parent = element.parentElement;
-                    let depth = 0;
-                    while (parent && depth < 3) {
-                        const parentStyle = window.getComputedStyle(parent);
-                        if (parentStyle.position === 'relative' || 
-                            parentStyle.position === 'absolute') {
-                            // Check for hidden children that might appear on hover
-                            const children = Array.from(parent.children);
-                            for (const child of children) {
-                                const childStyle = window.getComputedStyle(child);
-                                if (childStyle.display === 'none' || 
-                                    childStyle.visibility === 'hidden' ||
-                                    childStyle.opacity === '0') {
-                                    return true;
-                                }
-                            }
-                        }
-                        parent = parent.parentElement;
-                        depth++;
-                    }
-                    
-                    return false;
-                }
-                
-                // Scan all elements in the page
-                const allElements = document.querySelectorAll('*');
-                
-                allElements.forEach(element => {
-                    try {
-                        if (!isVisible(element)) return;
-                        
-                        const tagName = element.tagName.toLowerCase();
-                        const text = element.innerText?.trim() || 
-                                    element.textContent?.trim() || 
-                                    element.getAttribute('aria-label') || 
-                                    element.getAttribute('title') || '';
-                        
-                        // Skip if no meaningful content
-                        if (!text && tagName !== 'img' && tagName !== 'svg') return;
-                        
-                        // Skip very long text (likely not a hover target)
-                        if (text.length > 200) return;
-                        
-                        // Check if element or its interactive parent has hover behavior
-                        const isInteractive = hasHoverBehavior(element);
-                        
-                        if (isInteractive) {
-                            const xpath = getXPath(element);
-                            
-                            // Avoid duplicates
-                            if (seenElements.has(xpath)) return;
-                            seenElements.add(xpath);
-                            
-                            const rect = element.getBoundingClientRect();
-                            
-                            hoverableElements.push({
-                                tag: tagName,
-                                text: text.substring(0, 100),
-                                xpath: xpath,
-                                class: element.className,
-                                id: element.id || null,
-                                href: element.href || null,
-                                role: element.getAttribute('role') || null,
-                                ariaLabel: element.getAttribute('aria-label') || null,
-                                position: {
-                                    x: Math.round(rect.x),
-                                    y: Math.round(rect.y),
-                                    width: Math.round(rect.width),
-                                    height: Math.round(rect.height)
-                                }
-                            });
-                        }
-                    } catch (e) {
-                        // Skip problematic elements
-                    }
-                });
-                
-                return hoverableElements.slice(0, 50);
-            }
-            """
 
-            # Execute dynamic detection
-            potential_hover_elements = await self.page.evaluate(dynamic_hover_detection)
+            # Detector is pre-installed per context; send only the stub call
+            potential_hover_elements = await self.page.evaluate("() => window.__detectHover()")
             logger.info(f"Found {len(potential_hover_elements)} potential hover elements")
 
-            # Test each element for actual hover behavior
-            confirmed_hover_elements = []
-
-            for i, elem_info in enumerate(potential_hover_elements[:config.MAX_HOVER_ELEMENTS]):
-                try:
-                    # Locate element by XPath
-                    element = await self.page.query_selector(f"xpath={elem_info['xpath']}")
+            # Test each element for actual hover behavior, sharded across
+            # isolated contexts so the per-element waits overlap
+            confirmed_hover_elements = await self._probe_in_parallel(
+                potential_hover_elements[:config.MAX_HOVER_ELEMENTS],
+                self._batch_probe_hover
+            )
 
-                    if not element:
-                        continue
+            logger.info(f"Confirmed {len(confirmed_hover_elements)} hover-interactive elements")
+            return confirmed_hover_elements
 
-                    # Capture state before hover
-                    before_snapshot = await self._capture_page_state()
+        except Exception as e:
+            logger.error(f"Error analyzing hover elements: {str(e)}")
+            return []
 
-                    # Perform hover action
-                    await element.hover()
-                    await asyncio.sleep(config.HOVER_DELAY_MS / 1000)
+    async def _probe_in_parallel(self, candidates: List[Dict[str, Any]], probe) -> List[Dict[str, Any]]:
+        """
+        Shard probe candidates across isolated browser contexts and test them
+        concurrently. Each probe is dominated by hover/click settle time, so
+        wall time drops roughly linearly with config.HOVER_PARALLELISM.
+        """
+        if not candidates:
+            return []
 
-                    # Capture state after hover
-                    after_snapshot = await self._capture_page_state()
+        # Even a single worker gets its own context: hover and popup probes
+        # run concurrently via asyncio.gather, and sharing self.page would
+        # let one side's clicks (modals, navigation) contaminate the other's
+        # snapshot diffs
+        workers = min(config.HOVER_PARALLELISM, len(candidates))
 
-                    # Check if hover revealed new content
-                    if self._has_content_changed(before_snapshot, after_snapshot):
-                        revealed = await self._get_revealed_elements(before_snapshot, after_snapshot)
+        contexts = []
+        try:
+            pages = []
+            for _ in range(workers):
+                context = await self._new_context()
+                page = await context.new_page()
+                page.set_default_timeout(self.config.timeout)
+                await page.goto(self.page.url, wait_until='domcontentloaded')
+                await page.evaluate(_GWAIT_JS, 2000)
+                contexts.append(context)
+                pages.append(page)
+
+            chunks = [candidates[i::workers] for i in range(workers)]
+            results = await asyncio.gather(
+                *[probe(page, chunk) for page, chunk in zip(pages, chunks)],
+                return_exceptions=True
+            )
 
-                        confirmed_hover_elements.append({
-                            **elem_info,
-                            'hover_confirmed': True,
-                            'revealed_elements': revealed
-                        })
+            confirmed = []
+            for chunk_result in results:
+                if isinstance(chunk_result, BaseException):
+                    logger.warning(f"Probe shard failed: {str(chunk_result)}")
+                    continue
+                confirmed.extend(chunk_result)
+            return confirmed
+        finally:
+            for context in contexts:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
 
-                        logger.info(f"✓ Confirmed hover element: {elem_info['text'][:50]}")
+    async def _batch_probe_hover(self, page: Page, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Probe a shard of hover candidates with a single page.evaluate.
 
-                    # Move mouse away to reset
-                    await self.page.mouse.move(0, 0)
-                    await asyncio.sleep(0.3)
+        The per-candidate hover/snapshot/diff cycle runs entirely in-page, so
+        a shard of N candidates costs one CDP round-trip instead of ~6 per
+        element (query_selector, hover, two snapshots, mouse reset).
+        """
+        batch_probe_js = """
+        async (params) => {
+            const {selectors, delay} = params;
+
+            // Wait for the first DOM mutation, falling back to the fixed
+            // delay only when nothing reacts
+            const gwait = (ms) => new Promise(res => {
+                const mo = new MutationObserver(() => { mo.disconnect(); res(true); });
+                mo.observe(document.body, {childList: true, subtree: true, attributes: true});
+                setTimeout(() => { mo.disconnect(); res(false); }, ms);
+            });
+
+            const interactive = 'a, button, [role="menuitem"], [role="button"]';
+
+            const visible = (el) => {
+                const rect = el.getBoundingClientRect();
+                if (rect.width <= 0 || rect.height <= 0) return false;
+                const cs = window.getComputedStyle(el);
+                return cs.display !== 'none' &&
+                       cs.visibility !== 'hidden' &&
+                       cs.opacity !== '0';
+            };
+
+            // FNV-1a over the element text; snapshots carry one 32-bit hash
+            // per element instead of full text/tag/href records
+            const fnv = (s) => {
+                let x = 2166136261 >>> 0;
+                for (let i = 0; i < s.length; i++) {
+                    x = ((x ^ s.charCodeAt(i)) * 16777619) >>> 0;
+                }
+                return x;
+            };
+
+            const snapshot = () => {
+                const hashes = [];
+                document.querySelectorAll(interactive).forEach(el => {
+                    if (visible(el)) {
+                        hashes.push(fnv(el.innerText?.trim().substring(0, 100) || ''));
+                    }
+                });
+                return {
+                    hashes: hashes,
+                    htmlLength: document.body.innerHTML.length
+                };
+            };
 
-                except Exception as e:
-                    logger.debug(f"Error testing hover element {i}: {str(e)}")
-                    continue
+            const results = [];
 
-            logger.info(f"Confirmed {len(confirmed_hover_elements)} hover-interactive elements")
-            return confirmed_hover_elements
+            for (const sel of selectors) {
+                try {
+                    const el = document.querySelector(sel);
 
-        except Exception as e:
-            logger.error(f"Error analyzing hover elements: {str(e)}")
-            return []
+                    if (!el) {
+                        results.push(null);
+                        continue;
+                    }
 
-    async def _capture_page_state(self) -> Dict[str, Any]:
-        """Capture current page state for comparison"""
-        try:
-            state = await self.page.evaluate("""
-                () => {
-                    const elements = [];
-                    document.querySelectorAll('a, button, [role="menuitem"], [role="button"]').forEach(el => {
-                        const style = window.getComputedStyle(el);
-                        const rect = el.getBoundingClientRect();
-                        if (style.display !== 'none' && 
-                            style.visibility !== 'hidden' && 
-                            style.opacity !== '0' &&
-                            rect.width > 0 && rect.height > 0) {
-                            elements.push({
-                                text: el.innerText?.trim().substring(0, 100),
-                                tag: el.tagName,
-                                href: el.href || null,
-                                visible: true
-                            });
+                    const before = snapshot();
+
+                    el.dispatchEvent(new MouseEvent('mouseover', {bubbles: true}));
+                    el.dispatchEvent(new MouseEvent('mouseenter', {bubbles: true}));
+                    await gwait(delay);
+
+                    const after = snapshot();
+
+                    const changed = after.hashes.length > before.hashes.length ||
+                                    after.htmlLength !== before.htmlLength;
+
+                    // Resolve hashes back to display text only when the
+                    // cheap diff says something actually changed
+                    const revealed = [];
+                    if (changed) {
+                        const beforeHashes = new Set(before.hashes);
+                        for (const el of document.querySelectorAll(interactive)) {
+                            if (!visible(el)) continue;
+                            const text = el.innerText?.trim().substring(0, 100) || '';
+                            if (text && !beforeHashes.has(fnv(text))) {
+                                revealed.push({
+                                    text: text,
+                                    tag: el.tagName,
+                                    href: el.href || null,
+                                    visible: true
+                                });
+                                if (revealed.length >= 5) break;
+                            }
                         }
-                    });
-                    return {
-                        visible_elements: elements,
-                        html_length: document.body.innerHTML.length
-                    };
-                }
-            """)
-            return state
-        except:
-            return {'visible_elements': [], 'html_length': 0}
-
-    def _has_content_changed(self, before: Dict, after: Dict) -> bool:
-        """Check if hover action revealed new content"""
-        before_count = len(before.get('visible_elements', []))
-        after_count = len(after.get('visible_elements', []))
-
-        # New elements appeared
-        if after_count > before_count:
-            return True
+                    }
 
-        # HTML changed
-        if after.get('html_length', 0) != before.get('html_length', 0):
-            return True
+                    el.dispatchEvent(new MouseEvent('mouseleave', {bubbles: true}));
+                    results.push({changed: changed, revealed: revealed});
+                } catch (e) {
+                    results.push(null);
+                }
+            }
 
-        return False
+            return results;
+        }
+        """
 
-    async def _get_revealed_elements(self, before: Dict, after: Dict) -> List[Dict]:
-        """Get elements that appeared after hover"""
-        before_texts = {e['text'] for e in before.get('visible_elements', [])}
-        after_elements = after.get('visible_elements', [])
+        outcomes = await page.evaluate(batch_probe_js, {
+            'selectors': [elem_info['selector'] for elem_info in chunk],
+            'delay': config.HOVER_DELAY_MS
+        })
 
-        revealed = []
-        for elem in after_elements:
-            if elem['text'] not in before_texts and elem['text']:
-                revealed.append(elem)
+        confirmed = []
+        for elem_info, outcome in zip(chunk, outcomes):
+            if outcome and outcome['changed']:
+                confirmed.append({
+                    **elem_info,
+                    'hover_confirmed': True,
+                    'revealed_elements': outcome['revealed']
+                })
+                logger.info(f"✓ Confirmed hover element: {elem_info['text'][:50]}")
 
-        return revealed[:5]  # Limit to top 5
+        return confirmed
 
     async def analyze_popup_elements(self) -> List[Dict[str, Any]]:
         """
@@ -367,176 +664,15 @@ class BrowserAutomation:
         try:
             logger.info("Analyzing popup/modal elements dynamically...")
 
-            popup_elements = []
 
-            # Find clickable elements that might trigger popups
-            potential_triggers = await self.page.query_selector_all(
-                'a[href*="modal"], button[data-toggle="modal"], '
-                'a[data-toggle="modal"], button[aria-haspopup="dialog"], '
-                '[onclick*="modal"], [onclick*="popup"], '
-                'a[href="#"], button[type="button"]'
-            )
-
-            # JavaScript for dynamic popup trigger detection
-            dynamic_popup_detection = """
-            () => {
-                const popupTriggers = [];
-                const seenElements = new Set();
-                
-                function getXPath(element) {
-                    if (element.id) return `//*[@id="${element.id}"]`;
-                    const parts = [];
-                    let current = element;
-                    while (current && current.nodeType === Node.ELEMENT_NODE) {
-                        let index = 0;
-                        let sibling = current.previousSibling;
-                        while (sibling) {
-                            if (sibling.nodeType === Node.ELEMENT_NODE && 
-                                sibling.nodeName === current.nodeName) index++;
-                            sibling = sibling.previousSibling;
-                        }
-                        const tagName = current.nodeName.toLowerCase();
-                        const pathIndex = index > 0 ? `[${index + 1}]` : '';
-                        parts.unshift(tagName + pathIndex);
-                        current = current.parentNode;
-                    }
-                    return '/' + parts.join('/');
-                }
-                
-                function isVisible(element) {
-                    const rect = element.getBoundingClientRect();
-                    const style = window.getComputedStyle(element);
-                    return rect.width > 0 && rect.height > 0 && 
-                           style.display !== 'none' && 
-                           style.visibility !== 'hidden';
-                }
-                
-                function mightTriggerPopup(element) {
-                    // Check onclick attribute
-                    if (element.hasAttribute('onclick')) return true;
-                    
-                    // Check data attributes suggesting modals
-                    const dataAttrs = Array.from(element.attributes)
-                        .filter(a => a.name.startsWith('data-'))
-                        .map(a => a.name.toLowerCase());
-                    
-                    const popupKeywords = ['modal', 'popup', 'dialog', 'overlay', 
-                                          'toggle', 'open', 'show', 'trigger'];
-                    
-                    for (const attr of dataAttrs) {
-                        for (const keyword of popupKeywords) {
-                            if (attr.includes(keyword)) return true;
-                        }
-                    }
-                    
-                    // Check aria attributes
-                    const ariaExpanded = element.getAttribute('aria-expanded');
-                    const ariaHaspopup = element.getAttribute('aria-haspopup');
-                    if (ariaExpanded || ariaHaspopup) return true;
-                    
-                    // Check button text for modal keywords
-                    const text = (element.innerText || element.textContent || '').toLowerCase();
-                    const textKeywords = ['learn more', 'sign up', 'login', 'subscribe', 
-                                        'register', 'join', 'get started', 'more info',
-                                        'details', 'view', 'show', 'open'];
-                    
-                    for (const keyword of textKeywords) {
-                        if (text.includes(keyword)) return true;
-                    }
-                    
-                    return false;
-                }
-                
-                // Scan for clickable elements
-                const clickables = document.querySelectorAll('button, a, [onclick], [role="button"]');
-                
-                clickables.forEach(element => {
-                    try {
-                        if (!isVisible(element)) return;
-                        
-                        const text = element.innerText?.trim() || 
-                                    element.textContent?.trim() || '';
-                        
-                        if (!text || text.length > 100) return;
-                        
-                        if (mightTriggerPopup(element)) {
-                            const xpath = getXPath(element);
-                            if (seenElements.has(xpath)) return;
-                            seenElements.add(xpath);
-                            
-                            const rect = element.getBoundingClientRect();
-                            
-                            popupTriggers.push({
-                                tag: element.tagName.toLowerCase(),
-                                text: text.substring(0, 100),
-                                xpath: xpath,
-                                class: element.className,
-                                id: element.id || null,
-                                onclick: element.getAttribute('onclick') || null,
-                                dataAttrs: Array.from(element.attributes)
-                                    .filter(a => a.name.startsWith('data-'))
-                                    .map(a => ({name: a.name, value: a.value})),
-                                ariaHaspopup: element.getAttribute('aria-haspopup'),
-                                position: {
-                                    x: Math.round(rect.x),
-                                    y: Math.round(rect.y)
-                                }
-                            });
-                        }
-                    } catch (e) {}
-                });
-                
-                return popupTriggers.slice(0, 30);
-            }
-            """
-
-            potential_triggers = await self.page.evaluate(dynamic_popup_detection)
+            potential_triggers = await self.page.evaluate("() => window.__detectPopup()")
             logger.info(f"Found {len(potential_triggers)} potential popup triggers")
 
-            # Test each trigger
-            confirmed_popup_triggers = []
-
-            for i, trigger_info in enumerate(potential_triggers[:config.MAX_POPUP_ELEMENTS]):
-                try:
-                    # Locate element
-                    element = await self.page.query_selector(f"xpath={trigger_info['xpath']}")
-
-                    if not element:
-                        continue
-
-                    # Count modals before click
-                    before_modals = await self._count_modals()
-
-                    # Click element
-                    await element.click()
-                    await asyncio.sleep(1)
-
-                    # Count modals after click
-                    after_modals = await self._count_modals()
-                    modal_details = await self._get_modal_details()
-
-                    # Check if popup appeared
-                    if after_modals > before_modals or modal_details:
-                        confirmed_popup_triggers.append({
-                            **trigger_info,
-                            'popup_confirmed': True,
-                            'popup_details': modal_details
-                        })
-
-                        logger.info(f"✓ Confirmed popup trigger: {trigger_info['text'][:50]}")
-
-                        # Try to close popup
-                        await self._close_any_modal()
-                        await asyncio.sleep(0.5)
-
-                except Exception as e:
-                    logger.debug(f"Error testing popup trigger {i}: {str(e)}")
-                    # Try to recover by reloading if stuck
-                    try:
-                        await self._close_any_modal()
-                    except:
-                        pass
-                    continue
+            # Test each trigger, sharded across isolated contexts
+            confirmed_popup_triggers = await self._probe_in_parallel(
+                potential_triggers[:config.MAX_POPUP_ELEMENTS],
+                self._batch_probe_popup
+            )
 
             logger.info(f"Confirmed {len(confirmed_popup_triggers)} popup-triggering elements")
             return confirmed_popup_triggers
@@ -545,129 +681,167 @@ class BrowserAutomation:
             logger.error(f"Error analyzing popup elements: {str(e)}")
             return []
 
-    async def _count_modals(self) -> int:
-        """Count visible modals/dialogs"""
-        try:
-            count = await self.page.evaluate("""
-                () => {
-                    let count = 0;
-                    const selectors = ['[role="dialog"]', '.modal', '.popup', 
-                                     '[class*="modal"]', '[class*="popup"]',
-                                     '[class*="dialog"]', '[class*="overlay"]'];
-                    
-                    selectors.forEach(selector => {
-                        document.querySelectorAll(selector).forEach(el => {
-                            const style = window.getComputedStyle(el);
-                            const rect = el.getBoundingClientRect();
-                            if (style.display !== 'none' && 
-                                style.visibility !== 'hidden' &&
-                                rect.width > 0 && rect.height > 0) {
-                                count++;
-                            }
+    async def _batch_probe_popup(self, page: Page, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Probe a shard of popup-trigger candidates with a single page.evaluate.
+
+        The click/count/inspect/close cycle for every candidate runs in-page,
+        replacing the ~5 CDP round-trips per trigger of the old loop.
+        """
+        batch_probe_js = """
+        async (params) => {
+            const {selectors, settle} = params;
+
+            // Wait for the first DOM mutation, falling back to the fixed
+            // delay only when nothing reacts
+            const gwait = (ms) => new Promise(res => {
+                const mo = new MutationObserver(() => { mo.disconnect(); res(true); });
+                mo.observe(document.body, {childList: true, subtree: true, attributes: true});
+                setTimeout(() => { mo.disconnect(); res(false); }, ms);
+            });
+
+            // Count and inspect visible modals in one union-selector scan
+            const inspectModals = () => {
+                const sel = '[role="dialog"], .modal, .popup, [class*="modal"], ' +
+                            '[class*="popup"], [class*="dialog"], [class*="overlay"]';
+                let count = 0;
+                const details = [];
+
+                document.querySelectorAll(sel).forEach(el => {
+                    const rect = el.getBoundingClientRect();
+                    if (rect.width <= 0 || rect.height <= 0) return;
+                    const cs = window.getComputedStyle(el);
+                    if (cs.display === 'none' || cs.visibility === 'hidden') return;
+
+                    count++;
+                    if (rect.width > 100 && rect.height > 100) {
+                        details.push({
+                            text: el.innerText?.trim().substring(0, 200),
+                            class: el.className,
+                            role: el.getAttribute('role'),
+                            hasCloseButton: !!el.querySelector('[aria-label*="close"], [class*="close"], button')
                         });
-                    });
-                    
-                    return count;
+                    }
+                });
+
+                return {count: count, details: details};
+            };
+
+            // Escape first, then one union-selector lookup for a close
+            // button instead of probing five selectors in sequence
+            const closeAnyModal = async () => {
+                document.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', bubbles: true}));
+                await gwait(300);
+
+                const btn = document.querySelector(
+                    '[aria-label*="close"], [class*="close"], ' +
+                    'button[class*="close"], .modal button, [role="dialog"] button'
+                );
+                if (btn) {
+                    btn.click();
+                    await gwait(300);
                 }
-            """)
-            return count
-        except:
-            return 0
+            };
 
-    async def _get_modal_details(self) -> List[Dict]:
-        """Get details of visible modals"""
-        try:
-            details = await self.page.evaluate("""
-                () => {
-                    const modals = [];
-                    const selectors = ['[role="dialog"]', '.modal', '.popup',
-                                     '[class*="modal"]', '[class*="popup"]'];
-                    
-                    selectors.forEach(selector => {
-                        document.querySelectorAll(selector).forEach(el => {
-                            const style = window.getComputedStyle(el);
-                            const rect = el.getBoundingClientRect();
-                            if (style.display !== 'none' && 
-                                style.visibility !== 'hidden' &&
-                                rect.width > 100 && rect.height > 100) {
-                                modals.push({
-                                    text: el.innerText?.trim().substring(0, 200),
-                                    class: el.className,
-                                    role: el.getAttribute('role'),
-                                    hasCloseButton: !!el.querySelector('[aria-label*="close"], [class*="close"], button')
-                                });
-                            }
-                        });
-                    });
-                    
-                    return modals;
+            const results = [];
+
+            for (const sel of selectors) {
+                try {
+                    const el = document.querySelector(sel);
+
+                    if (!el) {
+                        results.push(null);
+                        continue;
+                    }
+
+                    const before = inspectModals();
+
+                    el.click();
+                    await gwait(settle);
+
+                    const after = inspectModals();
+
+                    if (after.count > before.count || after.details.length) {
+                        results.push({confirmed: true, details: after.details});
+                        await closeAnyModal();
+                        await gwait(500);
+                    } else {
+                        results.push({confirmed: false});
+                    }
+                } catch (e) {
+                    try { await closeAnyModal(); } catch (e2) {}
+                    results.push(null);
                 }
-            """)
-            return details
-        except:
-            return []
+            }
 
-    async def _close_any_modal(self):
-        """Attempt to close any open modal"""
-        try:
-            # Try Escape key
-            await self.page.keyboard.press('Escape')
-            await asyncio.sleep(0.3)
-
-            # Try clicking close button
-            close_selectors = [
-                '[aria-label*="close"]',
-                '[class*="close"]',
-                'button[class*="close"]',
-                '.modal button',
-                '[role="dialog"] button'
-            ]
-
-            for selector in close_selectors:
-                try:
-                    close_btn = await self.page.query_selector(selector)
-                    if close_btn:
-                        await close_btn.click()
-                        await asyncio.sleep(0.3)
-                        break
-                except:
-                    continue
+            return results;
+        }
+        """
 
-        except:
-            pass
+        outcomes = await page.evaluate(batch_probe_js, {
+            'selectors': [trigger_info['selector'] for trigger_info in chunk],
+            'settle': 1000
+        })
+
+        confirmed = []
+        for trigger_info, outcome in zip(chunk, outcomes):
+            if outcome and outcome['confirmed']:
+                confirmed.append({
+                    **trigger_info,
+                    'popup_confirmed': True,
+                    'popup_details': outcome['details']
+                })
+                logger.info(f"✓ Confirmed popup trigger: {trigger_info['text'][:50]}")
+
+        return confirmed
 
     async def get_page_structure(self) -> Dict[str, Any]:
         """Get overall page structure"""
         try:
-            html = await self.page.content()
-            soup = BeautifulSoup(html, 'lxml')
-
-            structure = {
-                'title': await self.page.title(),
-                'url': self.page.url,
-                'nav_elements': len(soup.find_all(['nav', 'header'])),
-                'buttons': len(soup.find_all('button')),
-                'links': len(soup.find_all('a')),
-                'forms': len(soup.find_all('form')),
-                'has_navigation': bool(soup.find(['nav', 'header']))
-            }
-
-            return structure
+            # Count against the live DOM instead of shipping the full HTML
+            # over CDP and re-parsing it in Python
+            return await self.page.evaluate("""
+                () => ({
+                    title: document.title,
+                    url: location.href,
+                    nav_elements: document.querySelectorAll('nav, header').length,
+                    buttons: document.querySelectorAll('button').length,
+                    links: document.querySelectorAll('a').length,
+                    forms: document.querySelectorAll('form').length,
+                    has_navigation: !!document.querySelector('nav, header')
+                })
+            """)
         except Exception as e:
             logger.error(f"Error getting page structure: {str(e)}")
             return {}
 
 # Convenience function for synchronous usage
-def run_browser_analysis(url: str, browser_config: Optional[BrowserConfig] = None) -> Dict[str, Any]:
-    """Run browser analysis synchronously"""
+def run_browser_analysis(urls: Union[str, List[str]],
+                         browser_config: Optional[BrowserConfig] = None) -> Dict[str, Any]:
+    """
+    Run browser analysis synchronously for one URL or a list of URLs.
+
+    A list reuses one warm browser across all URLs (reset_page between
+    them), so only the first URL pays the Chromium launch cost. A single
+    URL returns its result dict directly; a list returns {url: result}.
+    """
+    async def _analyze_one(browser, url):
+        if await browser.navigate_to_url(url):
+            return {
+                'hover_elements': await browser.analyze_hover_elements(),
+                'popup_elements': await browser.analyze_popup_elements(),
+                'page_structure': await browser.get_page_structure()
+            }
+        return {'hover_elements': [], 'popup_elements': [], 'page_structure': {}}
+
     async def _analyze():
+        url_list = [urls] if isinstance(urls, str) else list(urls)
+        results = {}
         async with BrowserAutomation(browser_config) as browser:
-            if await browser.navigate_to_url(url):
-                return {
-                    'hover_elements': await browser.analyze_hover_elements(),
-                    'popup_elements': await browser.analyze_popup_elements(),
-                    'page_structure': await browser.get_page_structure()
-                }
-            return {'hover_elements': [], 'popup_elements': [], 'page_structure': {}}
+            for i, url in enumerate(url_list):
+                if i:
+                    await browser.reset_page()
+                results[url] = await _analyze_one(browser, url)
+        return results[urls] if isinstance(urls, str) else results
 
     return asyncio.run(_analyze())
\ No newline at end of file
@@ -4,15 +4,36 @@ Handles environment variables and application settings
 """
 import os
 from pathlib import Path
-from typing import Optional
-from pydantic import BaseModel, Field
-from dotenv import load_dotenv
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+def _load_env(path: str = ".env") -> None:
+    """Load KEY=VALUE pairs from a .env file into os.environ.
+
+    A minimal stand-in for python-dotenv: existing environment variables
+    always win, comments and blank lines are skipped, and surrounding
+    quotes are stripped from values.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, _, value = line.partition("=")
+                os.environ.setdefault(key.strip(), value.strip().strip('"').strip("'"))
+    except FileNotFoundError:
+        pass
 
 # Load environment variables
-load_dotenv()
+_load_env()
 
 class LLMConfig(BaseModel):
     """LLM Provider Configuration"""
+    # Frozen models skip pydantic's mutation hooks, making the per-request
+    # self.config.* reads in the providers plain attribute lookups
+    model_config = ConfigDict(frozen=True)
+
     provider: str = Field(default="groq", description="LLM provider: groq, openai, claude")
     model: str = Field(default="openai/gpt-oss-20b", description="Model name")
     temperature: float = Field(default=0.3, ge=0.0, le=2.0)
@@ -21,14 +42,23 @@ class LLMConfig(BaseModel):
 
 class BrowserConfig(BaseModel):
     """Browser Automation Configuration"""
+    model_config = ConfigDict(frozen=True)
+
     headless: bool = Field(default=True, description="Run browser in headless mode")
     timeout: int = Field(default=30000, description="Default timeout in milliseconds")
     viewport_width: int = Field(default=1920)
     viewport_height: int = Field(default=1080)
     slow_mo: int = Field(default=100, description="Slow down operations by ms")
+    # Stylesheets are never blocked: hover detection reads document.styleSheets
+    block_resources: List[str] = Field(
+        default=["image", "font", "media"],
+        description="Resource types aborted during analysis (empty list disables blocking)"
+    )
 
 class AppConfig(BaseModel):
     """Application Configuration"""
+    model_config = ConfigDict(frozen=True)
+
     # Paths
     BASE_DIR: Path = Path(__file__).parent.parent
     DB_PATH: Path = BASE_DIR / "bdd_tests.db"
@@ -39,6 +69,9 @@ class AppConfig(BaseModel):
     HOST: str = "0.0.0.0"
     PORT: int = 5000
     DEBUG: bool = False
+    MAX_CONCURRENT_TASKS: int = 5
+    # Redis pub/sub URL for multi-worker WebSocket fan-out (empty = in-process)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
     
     # LLM Settings
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
@@ -74,14 +107,11 @@ class AppConfig(BaseModel):
     MAX_HOVER_ELEMENTS: int = 20
     MAX_POPUP_ELEMENTS: int = 10
     HOVER_DELAY_MS: int = 500
+    HOVER_PARALLELISM: int = 4
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
 
 # Global configuration instance
 config = AppConfig()
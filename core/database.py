@@ -2,225 +2,376 @@
 Database Models and Schema
 SQLite-based storage for test generation tasks and artifacts
 """
+import atexit
+import os
 import sqlite3
-import json
+import orjson
+import queue
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from contextlib import contextmanager
 from .config import config
 
+# Bump SCHEMA_VERSION whenever SCHEMA_SQL changes; init_database re-applies
+# the (idempotent) script only when a database predates the current version.
+SCHEMA_VERSION = 2
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS test_tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    llm_provider TEXT NOT NULL,
+    llm_model TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_message TEXT,
+    progress INTEGER DEFAULT 0,
+    total_steps INTEGER DEFAULT 100,
+    current_step TEXT
+);
+
+CREATE TABLE IF NOT EXISTS dom_analysis (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    hover_elements TEXT,
+    popup_elements TEXT,
+    page_structure TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (task_id) REFERENCES test_tasks(id)
+);
+
+CREATE TABLE IF NOT EXISTS generated_features (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    feature_type TEXT NOT NULL,
+    feature_content TEXT NOT NULL,
+    file_path TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (task_id) REFERENCES test_tasks(id)
+);
+
+CREATE TABLE IF NOT EXISTS execution_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    log_level TEXT NOT NULL,
+    message TEXT NOT NULL,
+    details TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (task_id) REFERENCES test_tasks(id)
+);
+
+CREATE TABLE IF NOT EXISTS config_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    llm_provider TEXT NOT NULL,
+    llm_model TEXT NOT NULL,
+    settings TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_exec_logs_task_created
+    ON execution_logs(task_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_gen_features_task_created
+    ON generated_features(task_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_dom_analysis_task
+    ON dom_analysis(task_id);
+
+ANALYZE;
+"""
+
+# Statement text hoisted to module constants: stable string identity lets
+# sqlite3's statement cache hit on pointer comparison instead of equality
+_SQL_INSERT_TASK = """
+    INSERT INTO test_tasks (url, llm_provider, llm_model, status)
+    VALUES (?, ?, ?, 'pending')
+"""
+
+_SQL_UPDATE_PROGRESS = "UPDATE test_tasks SET progress = ? WHERE id = ?"
+
+_SQL_UPDATE_TASK = """
+    UPDATE test_tasks SET
+        status = ?,
+        progress = COALESCE(?, progress),
+        current_step = COALESCE(?, current_step),
+        error_message = COALESCE(?, error_message),
+        started_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE started_at END,
+        completed_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE completed_at END
+    WHERE id = ?
+"""
+
+_SQL_INSERT_DOM_ANALYSIS = """
+    INSERT INTO dom_analysis (task_id, hover_elements, popup_elements, page_structure)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_INSERT_FEATURE = """
+    INSERT INTO generated_features (task_id, feature_type, feature_content, file_path)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_INSERT_LOG = """
+    INSERT INTO execution_logs (task_id, log_level, message, details)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_SELECT_TASK = "SELECT * FROM test_tasks WHERE id = ?"
+
+_SQL_SELECT_ALL_TASKS = """
+    SELECT * FROM test_tasks
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_SQL_SELECT_FEATURES = """
+    SELECT * FROM generated_features
+    WHERE task_id = ?
+    ORDER BY created_at
+"""
+
+_SQL_SELECT_FEATURE_BY_TYPE = """
+    SELECT feature_type, file_path FROM generated_features
+    WHERE task_id = ? AND feature_type = ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+_SQL_SELECT_LOGS = """
+    SELECT * FROM execution_logs
+    WHERE task_id = ?
+    ORDER BY created_at
+"""
+
 class DatabaseManager:
     """Manages SQLite database operations"""
-    
+
+    READ_POOL_SIZE = 4
+    LOG_FLUSH_INTERVAL = 0.2
+    LOG_FLUSH_BATCH = 256
+
     def __init__(self, db_path: Path = config.DB_PATH):
         self.db_path = db_path
+        # One long-lived connection keeps SQLite's page cache and prepared
+        # statements warm instead of rebuilding them per call
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None,
+            cached_statements=512
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+        """)
         self.init_database()
-    
+
+        # WAL lets readers run alongside the single writer; a small pool of
+        # read-only connections keeps concurrent SELECTs off the write lock
+        self._read_pool: queue.Queue = queue.Queue(maxsize=self.READ_POOL_SIZE)
+        for _ in range(self.READ_POOL_SIZE):
+            reader = sqlite3.connect(
+                f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            reader.row_factory = sqlite3.Row
+            self._read_pool.put(reader)
+
+        # Log entries buffer in memory and flush in batches so the pipeline's
+        # per-step add_log calls stop paying one transaction each
+        self._log_buf: deque = deque()
+        self._log_cv = threading.Condition()
+        self._log_closing = False
+        self._log_thread = threading.Thread(
+            target=self._log_flusher, name="db-log-flusher", daemon=True
+        )
+        self._log_thread.start()
+        atexit.register(self._drain_logs)
+        # Only the forking thread survives os.fork(); respawn the flusher in
+        # children (e.g. the start.py pre-warm daemon) so add_log keeps
+        # reaching the database
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._respawn_log_flusher)
+
+        # Last status written per task, so progress-only ticks can skip the
+        # full COALESCE update (see update_task_status)
+        self._status_cache: Dict[int, str] = {}
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        """Context manager yielding the shared connection in a transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                self._conn.execute("ROLLBACK")
+                raise e
+
+    @contextmanager
+    def get_read_connection(self):
+        """Context manager borrowing a read-only connection from the pool"""
+        conn = self._read_pool.get()
         try:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
         finally:
-            conn.close()
+            self._read_pool.put(conn)
+
+    def close(self):
+        """Flush pending logs, then close all connections"""
+        self._log_closing = True
+        with self._log_cv:
+            self._log_cv.notify()
+        self._log_thread.join(timeout=2)
+        self._drain_logs()
+        self._conn.close()
+        while not self._read_pool.empty():
+            self._read_pool.get_nowait().close()
     
     def init_database(self):
-        """Initialize database schema"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Test Generation Tasks Table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS test_tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    llm_provider TEXT NOT NULL,
-                    llm_model TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    started_at TIMESTAMP,
-                    completed_at TIMESTAMP,
-                    error_message TEXT,
-                    progress INTEGER DEFAULT 0,
-                    total_steps INTEGER DEFAULT 100,
-                    current_step TEXT
-                )
-            """)
-            
-            # DOM Analysis Results Table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS dom_analysis (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id INTEGER NOT NULL,
-                    hover_elements TEXT,
-                    popup_elements TEXT,
-                    page_structure TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (task_id) REFERENCES test_tasks(id)
-                )
-            """)
-            
-            # Generated Features Table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS generated_features (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id INTEGER NOT NULL,
-                    feature_type TEXT NOT NULL,
-                    feature_content TEXT NOT NULL,
-                    file_path TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (task_id) REFERENCES test_tasks(id)
-                )
-            """)
-            
-            # Execution Logs Table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS execution_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id INTEGER NOT NULL,
-                    log_level TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    details TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (task_id) REFERENCES test_tasks(id)
-                )
-            """)
-            
-            # Configuration History Table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS config_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    llm_provider TEXT NOT NULL,
-                    llm_model TEXT NOT NULL,
-                    settings TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-    
+        """Initialize database schema (no-op when already current)"""
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
     def create_task(self, url: str, llm_provider: str, llm_model: str) -> int:
         """Create a new test generation task"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO test_tasks (url, llm_provider, llm_model, status)
-                VALUES (?, ?, ?, 'pending')
-            """, (url, llm_provider, llm_model))
-            return cursor.lastrowid
+            return conn.execute(_SQL_INSERT_TASK,
+                                (url, llm_provider, llm_model)).lastrowid
     
     def update_task_status(self, task_id: int, status: str, 
                           progress: Optional[int] = None,
                           current_step: Optional[str] = None,
                           error_message: Optional[str] = None):
         """Update task status and progress"""
+        # Fast path: the pipeline bumps progress after every step, so a pure
+        # progress tick (same status, no other fields, no timestamp
+        # transition) takes a one-column autocommit update
+        if (progress is not None and progress != 0
+                and current_step is None and error_message is None
+                and status == self._status_cache.get(task_id)):
+            with self._lock:
+                self._conn.execute(_SQL_UPDATE_PROGRESS, (progress, task_id))
+            return
+
+        # A single fixed SQL literal keeps the prepared statement cached;
+        # COALESCE/CASE handle the optional fields the old dynamic query
+        # stitched together per call
+        mark_started = 1 if status == 'running' and progress == 0 else 0
+        mark_completed = 1 if status in ('completed', 'failed') else 0
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            updates = ["status = ?"]
-            params = [status]
-            
-            if progress is not None:
-                updates.append("progress = ?")
-                params.append(progress)
-            
-            if current_step is not None:
-                updates.append("current_step = ?")
-                params.append(current_step)
-            
-            if error_message is not None:
-                updates.append("error_message = ?")
-                params.append(error_message)
-            
-            if status == 'running' and progress == 0:
-                updates.append("started_at = CURRENT_TIMESTAMP")
-            elif status == 'completed' or status == 'failed':
-                updates.append("completed_at = CURRENT_TIMESTAMP")
-            
-            params.append(task_id)
-            query = f"UPDATE test_tasks SET {', '.join(updates)} WHERE id = ?"
-            cursor.execute(query, params)
+            conn.execute(_SQL_UPDATE_TASK,
+                         (status, progress, current_step, error_message,
+                          mark_started, mark_completed, task_id))
+        self._status_cache[task_id] = status
     
     def save_dom_analysis(self, task_id: int, hover_elements: List[Dict], 
                          popup_elements: List[Dict], page_structure: Dict):
         """Save DOM analysis results"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO dom_analysis (task_id, hover_elements, popup_elements, page_structure)
-                VALUES (?, ?, ?, ?)
-            """, (
+            conn.execute(_SQL_INSERT_DOM_ANALYSIS, (
                 task_id,
-                json.dumps(hover_elements),
-                json.dumps(popup_elements),
-                json.dumps(page_structure)
+                orjson.dumps(hover_elements).decode(),
+                orjson.dumps(popup_elements).decode(),
+                orjson.dumps(page_structure).decode()
             ))
     
     def save_feature(self, task_id: int, feature_type: str, 
                     feature_content: str, file_path: Optional[str] = None):
         """Save generated Gherkin feature"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO generated_features (task_id, feature_type, feature_content, file_path)
-                VALUES (?, ?, ?, ?)
-            """, (task_id, feature_type, feature_content, file_path))
+            conn.execute(_SQL_INSERT_FEATURE,
+                         (task_id, feature_type, feature_content, file_path))
     
     def add_log(self, task_id: int, log_level: str, message: str, details: Optional[Dict] = None):
-        """Add execution log entry"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO execution_logs (task_id, log_level, message, details)
-                VALUES (?, ?, ?, ?)
-            """, (task_id, log_level, message, json.dumps(details) if details else None))
+        """Buffer an execution log entry; a background thread batches inserts"""
+        row = (task_id, log_level, message,
+               orjson.dumps(details).decode() if details else None)
+        with self._log_cv:
+            self._log_buf.append(row)
+            self._log_cv.notify()
+
+    def _flush_logs(self):
+        """Insert up to one batch of buffered log rows in a single transaction"""
+        rows = []
+        while self._log_buf and len(rows) < self.LOG_FLUSH_BATCH:
+            rows.append(self._log_buf.popleft())
+        if not rows:
+            return
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(_SQL_INSERT_LOG, rows)
+        except sqlite3.Error:
+            # Re-buffer so the rows are retried on the next pass
+            self._log_buf.extendleft(reversed(rows))
+            raise
+
+    def _drain_logs(self):
+        """Flush everything still buffered (shutdown path)"""
+        while self._log_buf:
+            self._flush_logs()
+
+    def _respawn_log_flusher(self):
+        """Restart the flusher in a forked child, where threads do not survive"""
+        self._log_thread = threading.Thread(
+            target=self._log_flusher, name="db-log-flusher", daemon=True
+        )
+        self._log_thread.start()
+
+    def _log_flusher(self):
+        """Background loop: flush on notify or every LOG_FLUSH_INTERVAL"""
+        while not self._log_closing:
+            with self._log_cv:
+                if not self._log_buf:
+                    self._log_cv.wait(timeout=self.LOG_FLUSH_INTERVAL)
+            try:
+                self._flush_logs()
+            except sqlite3.Error:
+                # Keep the flusher alive; rows stay buffered for the next pass
+                pass
     
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
         """Get task details"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM test_tasks WHERE id = ?", (task_id,))
+            cursor.execute(_SQL_SELECT_TASK, (task_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
     def get_all_tasks(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all tasks"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM test_tasks 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            """, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(_SQL_SELECT_ALL_TASKS, (limit,))
+            return list(map(dict, cursor.fetchall()))
     
     def get_task_features(self, task_id: int) -> List[Dict[str, Any]]:
         """Get generated features for a task"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM generated_features 
-                WHERE task_id = ? 
-                ORDER BY created_at
-            """, (task_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(_SQL_SELECT_FEATURES, (task_id,))
+            return list(map(dict, cursor.fetchall()))
     
+    def get_task_feature(self, task_id: int, feature_type: str) -> Optional[Dict[str, Any]]:
+        """Get a single generated feature by type, avoiding a full-feature fetch"""
+        with self.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_SELECT_FEATURE_BY_TYPE, (task_id, feature_type))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
     def get_task_logs(self, task_id: int) -> List[Dict[str, Any]]:
         """Get execution logs for a task"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM execution_logs 
-                WHERE task_id = ? 
-                ORDER BY created_at
-            """, (task_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(_SQL_SELECT_LOGS, (task_id,))
+            return list(map(dict, cursor.fetchall()))
 
 # Global database instance
 db = DatabaseManager()
\ No newline at end of file
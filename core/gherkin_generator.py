@@ -3,8 +3,13 @@ Gherkin Feature Generator
 Uses LLMs to generate BDD test scenarios in Gherkin format
 Matches expected output format exactly
 """
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, Tuple
+import orjson
+import os
+import re
+import string
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from .llm_provider import BaseLLMProvider, LLMFactory, LLMConfig
@@ -13,18 +18,18 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
-class GherkinGenerator:
-    """Generates Gherkin BDD scenarios using LLMs - Clean, Simple Format"""
+# Output cleanup patterns, compiled once: drop user-story/Background blocks
+# up to the next Feature/Scenario, collapse blank runs, and ensure a blank
+# line after the Feature statement
+_USER_STORY_RE = re.compile(
+    r'^[ \t]*(As a|I want|So that|Background:).*?(?=^[ \t]*(Feature:|Scenario:)|\Z)',
+    re.M | re.S
+)
+_BLANK_RE = re.compile(r'\n{3,}')
+_FEATURE_GAP_RE = re.compile(r'(Feature:[^\n]*)\n(?!\n)')
 
-    def __init__(self, llm_provider: BaseLLMProvider):
-        self.llm = llm_provider
-        logger.info(f"Initialized Gherkin generator with {llm_provider.__class__.__name__}")
-
-    def _create_hover_prompt(self, url: str, hover_elements: List[Dict],
-                            page_structure: Dict) -> str:
-        """Create prompt for hover element test generation"""
-
-        system_context = """You are an expert QA automation engineer. Generate SIMPLE, CLEAN Gherkin scenarios.
+# Static system contexts, allocated once at import instead of per prompt
+_HOVER_SYSTEM_CONTEXT = """You are an expert QA automation engineer. Generate SIMPLE, CLEAN Gherkin scenarios.
 
         CRITICAL RULES:
         1. NO user stories (As a user, I want...)
@@ -40,20 +45,24 @@ class GherkinGenerator:
 
         Follow the EXACT format shown in examples."""
 
-        # Extract meaningful hover elements info
-        hover_info = []
-        for elem in hover_elements:  # Limit to top 3
-            hover_info.append({
-                'text': elem.get('text', '')[:50],
-                'revealed': [r.get('text', '')[:30] for r in elem.get('revealed_elements', [])]
-            })
+_POPUP_SYSTEM_CONTEXT = """You are an expert QA automation engineer. Generate SIMPLE, CLEAN Gherkin scenarios.
 
-        hover_data = json.dumps(hover_info, indent=2)
+            CRITICAL RULES:
+            1. NO user stories (As a user, I want...)
+            2. NO Background sections
+            3. NO data tables
+            4. NO technical details
+            5. Use "the user" not "I"
+            6. Keep scenarios simple
+            7. Maximum possible scenarios
+            8. Follow the exact format provided"""
 
-        prompt = f"""Generate a simple Gherkin feature file for hover interactions on this website:
+# Prompt templates: the constant text is allocated once and format_map only
+# substitutes the dynamic fields
+_HOVER_PROMPT_TMPL = """Generate a simple Gherkin feature file for hover interactions on this website:
 
         URL: {url}
-        Page Title: {page_structure.get('title', 'Unknown')}
+        Page Title: {title}
 
         Detected Hover Elements (that reveal dropdowns/menus when hovered):
         {hover_data}
@@ -87,64 +96,32 @@ class GherkinGenerator:
 
         Generate the Gherkin feature now:"""
 
-        return prompt, system_context
-
-
-    def _create_popup_prompt(self, url: str, popup_elements: List[Dict],
-                            page_structure: Dict) -> str:
-        """Create prompt for popup/modal test generation"""
-
-        system_context = """You are an expert QA automation engineer. Generate SIMPLE, CLEAN Gherkin scenarios.
-
-            CRITICAL RULES:
-            1. NO user stories (As a user, I want...)
-            2. NO Background sections
-            3. NO data tables
-            4. NO technical details
-            5. Use "the user" not "I"
-            6. Keep scenarios simple
-            7. Maximum possible scenarios
-            8. Follow the exact format provided"""
-
-        # Extract meaningful popup info
-        popup_info = []
-        for elem in popup_elements:  # Limit to top 3
-            popup_details = elem.get('popup_details', [])
-            popup_text = popup_details[0].get('text', '')[:150] if popup_details else 'modal content'
-
-            popup_info.append({
-                'trigger_text': elem.get('text', '')[:100],
-                'popup_content': popup_text
-            })
-
-        popup_data = json.dumps(popup_info, indent=2)
-
-        prompt = f"""Generate a simple Gherkin feature file for popup/modal interactions:
+_POPUP_PROMPT_TMPL = """Generate a simple Gherkin feature file for popup/modal interactions:
 
                 URL: {url}
-                Page Title: {page_structure.get('title', 'Unknown')}
-                
+                Page Title: {title}
+
                 Detected Popup Triggers (buttons/links that open modals):
                 {popup_data}
-                
+
                 EXPECTED OUTPUT FORMAT (FOLLOW EXACTLY):
-                
+
                 Feature: Validate "Button Name" pop-up functionality
-                
+
                 Scenario: Verify the cancel button in the pop-up
                   Given the user is on the "{url}" page
                   When the user clicks the "Button Name" button
                   Then a pop-up should appear with the title "Popup Title"
                   And the user clicks the "Cancel" button
                   Then the pop-up should close and the user should remain on the same page
-                
+
                 Scenario: Verify the continue button in the pop-up
                   Given the user is on the "{url}" page
                   When the user clicks the "Button Name" button
                   Then a pop-up should appear with the title "Popup Title"
                   And the user clicks the "Continue" button
                   Then the page should navigate or perform the expected action
-                
+
                 IMPORTANT:
                 - Use ONLY the format above
                 - Replace "Button Name" with actual detected trigger text
@@ -154,9 +131,93 @@ class GherkinGenerator:
                 - Use "the user" consistently
                 - Test both cancel and continue/confirm actions
                 - Generate all the scenarios maximum
-                
+
                 Generate the Gherkin feature now:"""
 
+# Fallback features built once; each call only substitutes $url
+_GENERIC_HOVER_TMPL = string.Template("""Feature: Validate navigation menu functionality
+
+Scenario: Verify hover reveals dropdown menu
+  Given the user is on the "$url" page
+  When the user hovers over a navigation menu item
+  Then a dropdown menu should appear
+  And the menu should contain clickable options
+
+Scenario: Verify navigation through dropdown menu
+  Given the user is on the "$url" page
+  When the user hovers over a navigation menu item
+  And clicks a link from the dropdown
+  Then the page URL should change to the selected page""")
+
+_GENERIC_POPUP_TMPL = string.Template("""Feature: Validate pop-up functionality
+
+Scenario: Verify the cancel button in the pop-up
+  Given the user is on the "$url" page
+  When the user clicks a button that triggers a pop-up
+  Then a pop-up should appear
+  And the user clicks the "Cancel" button
+  Then the pop-up should close and the user should remain on the same page
+
+Scenario: Verify the continue button in the pop-up
+  Given the user is on the "$url" page
+  When the user clicks a button that triggers a pop-up
+  Then a pop-up should appear
+  And the user clicks the "Continue" button
+  Then the expected action should be performed""")
+
+class GherkinGenerator:
+    """Generates Gherkin BDD scenarios using LLMs - Clean, Simple Format"""
+
+    def __init__(self, llm_provider: BaseLLMProvider):
+        self.llm = llm_provider
+        logger.info(f"Initialized Gherkin generator with {llm_provider.__class__.__name__}")
+
+    def _create_hover_prompt(self, url: str, hover_elements: List[Dict],
+                            page_structure: Dict) -> str:
+        """Create prompt for hover element test generation"""
+
+        system_context = _HOVER_SYSTEM_CONTEXT
+
+        # Extract meaningful hover elements info in one pass; tuples serialize
+        # as JSON arrays without the per-element dict allocations
+        hover_info = [
+            (elem.get('text', '')[:50],
+             tuple(r.get('text', '')[:30] for r in elem.get('revealed_elements', ())))
+            for elem in hover_elements
+        ]
+
+        hover_data = orjson.dumps(hover_info, option=orjson.OPT_INDENT_2).decode()
+
+        prompt = _HOVER_PROMPT_TMPL.format_map({
+            'url': url,
+            'title': page_structure.get('title', 'Unknown'),
+            'hover_data': hover_data
+        })
+
+        return prompt, system_context
+
+
+    def _create_popup_prompt(self, url: str, popup_elements: List[Dict],
+                            page_structure: Dict) -> str:
+        """Create prompt for popup/modal test generation"""
+
+        system_context = _POPUP_SYSTEM_CONTEXT
+
+        # Extract meaningful popup info in one pass (trigger text, popup content)
+        popup_info = [
+            (elem.get('text', '')[:100],
+             details[0].get('text', '')[:150] if (details := elem.get('popup_details')) else 'modal content')
+            for elem in popup_elements
+        ]
+
+        popup_data = orjson.dumps(popup_info, option=orjson.OPT_INDENT_2).decode()
+
+        prompt = _POPUP_PROMPT_TMPL.format_map({
+            'url': url,
+            'title': page_structure.get('title', 'Unknown'),
+            'popup_data': popup_data
+        })
+
         return prompt, system_context
 
     def generate_hover_features(self, url: str, hover_elements: List[Dict],
@@ -171,10 +232,13 @@ class GherkinGenerator:
 
             prompt, system_prompt = self._create_hover_prompt(url, hover_elements, page_structure)
 
-            feature_content = self.llm.generate(prompt, system_prompt)
+            # Stream chunks as the model produces them instead of blocking
+            # on the full completion
+            buf = StringIO()
+            for chunk in self.llm.generate_stream(prompt, system_prompt):
+                buf.write(chunk)
 
-            # Clean up the response
-            feature_content = self._clean_gherkin_output(feature_content)
+            feature_content = self._clean_gherkin_output(buf.getvalue())
 
             logger.info("Successfully generated hover features")
             return feature_content
@@ -195,10 +259,11 @@ class GherkinGenerator:
 
             prompt, system_prompt = self._create_popup_prompt(url, popup_elements, page_structure)
 
-            feature_content = self.llm.generate(prompt, system_prompt)
+            buf = StringIO()
+            for chunk in self.llm.generate_stream(prompt, system_prompt):
+                buf.write(chunk)
 
-            # Clean up the response
-            feature_content = self._clean_gherkin_output(feature_content)
+            feature_content = self._clean_gherkin_output(buf.getvalue())
 
             logger.info("Successfully generated popup features")
             return feature_content
@@ -207,94 +272,57 @@ class GherkinGenerator:
             logger.error(f"Error generating popup features: {str(e)}")
             raise
 
+    def generate_all(self, url: str, hover_elements: List[Dict],
+                     popup_elements: List[Dict],
+                     page_structure: Dict) -> Tuple[str, str]:
+        """
+        Generate hover and popup features concurrently.
+
+        The two LLM calls are independent and network-bound, so running
+        them on separate threads cuts wall time to the slower of the two.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hover_future = executor.submit(
+                self.generate_hover_features, url, hover_elements, page_structure
+            )
+            popup_future = executor.submit(
+                self.generate_popup_features, url, popup_elements, page_structure
+            )
+            return hover_future.result(), popup_future.result()
+
     def _clean_gherkin_output(self, content: str) -> str:
         """Clean and format Gherkin output"""
         # Remove markdown code blocks if present
         content = content.replace("```gherkin", "").replace("```", "")
 
-        # Remove any user story sections if LLM added them
-        lines = content.split('\n')
-        cleaned_lines = []
-        skip_until_scenario = False
-
-        for line in lines:
-            stripped = line.strip()
-
-            # Skip user story lines
-            if stripped.startswith('As a') or stripped.startswith('I want') or stripped.startswith('So that'):
-                skip_until_scenario = True
-                continue
-
-            # Skip Background sections
-            if stripped.startswith('Background:'):
-                skip_until_scenario = True
-                continue
-
-            # Stop skipping when we hit Feature or Scenario
-            if stripped.startswith('Feature:') or stripped.startswith('Scenario:'):
-                skip_until_scenario = False
-
-            # Don't skip if not in skip mode
-            if not skip_until_scenario and line.strip():
-                cleaned_lines.append(line.rstrip())
-
-        # Remove excessive blank lines and add proper spacing after Feature
-        final_lines = []
-        prev_blank = False
-        for i, line in enumerate(cleaned_lines):
-            if not line.strip():
-                if not prev_blank:
-                    final_lines.append(line)
-                    prev_blank = True
-            else:
-                final_lines.append(line)
-                prev_blank = False
-
-                # Add blank line after Feature statement
-                if line.strip().startswith('Feature:'):
-                    final_lines.append('')
-
-        return '\n'.join(final_lines)
+        # Regex pipeline replaces the old two-pass line loop; matching runs
+        # in C instead of per-line startswith checks
+        content = _USER_STORY_RE.sub("", content)
+        content = _BLANK_RE.sub("\n\n", content)
+        content = _FEATURE_GAP_RE.sub(r'\1\n\n', content)
+        return content.strip()
 
     def _generate_generic_hover_feature(self, url: str) -> str:
         """Generate a generic hover feature when no elements detected"""
-        return f"""Feature: Validate navigation menu functionality
-
-Scenario: Verify hover reveals dropdown menu
-  Given the user is on the "{url}" page
-  When the user hovers over a navigation menu item
-  Then a dropdown menu should appear
-  And the menu should contain clickable options
-
-Scenario: Verify navigation through dropdown menu
-  Given the user is on the "{url}" page
-  When the user hovers over a navigation menu item
-  And clicks a link from the dropdown
-  Then the page URL should change to the selected page"""
+        return _GENERIC_HOVER_TMPL.substitute(url=url)
 
     def _generate_generic_popup_feature(self, url: str) -> str:
         """Generate a generic popup feature when no elements detected"""
-        return f"""Feature: Validate pop-up functionality
-
-Scenario: Verify the cancel button in the pop-up
-  Given the user is on the "{url}" page
-  When the user clicks a button that triggers a pop-up
-  Then a pop-up should appear
-  And the user clicks the "Cancel" button
-  Then the pop-up should close and the user should remain on the same page
-
-Scenario: Verify the continue button in the pop-up
-  Given the user is on the "{url}" page
-  When the user clicks a button that triggers a pop-up
-  Then a pop-up should appear
-  And the user clicks the "Continue" button
-  Then the expected action should be performed"""
+        return _GENERIC_POPUP_TMPL.substitute(url=url)
 
     def save_feature_file(self, content: str, filename: str) -> Path:
         """Save Gherkin feature to file"""
         try:
             filepath = config.OUTPUTS_DIR / filename
-            filepath.write_text(content, encoding='utf-8')
+            # Write to a temp file then rename so readers never see a partial
+            # feature; encoding once up front also skips the TextIOWrapper copy
+            data = content.encode('utf-8')
+            tmp = filepath.with_name(filepath.name + '.tmp')
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, filepath)
+            finally:
+                tmp.unlink(missing_ok=True)
             logger.info(f"Saved feature file: {filepath}")
             return filepath
         except Exception as e:
@@ -3,8 +3,11 @@ LLM Provider Abstraction
 Supports Groq, OpenAI, and Claude with unified interface
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Iterator, Optional, Dict, Any
+import hashlib
 import json
+import threading
 from groq import Groq
 from openai import OpenAI
 from anthropic import Anthropic
@@ -25,6 +28,10 @@ class BaseLLMProvider(ABC):
         """Generate text completion"""
         pass
 
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Yield completion text chunks as they arrive (default: one chunk)"""
+        yield self.generate(prompt, system_prompt)
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if provider is available"""
@@ -61,6 +68,28 @@ class GroqProvider(BaseLLMProvider):
             logger.error(f"Groq generation error: {str(e)}")
             raise
 
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks from Groq"""
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            response = self.client.chat.completions.create(
+                model=self.config.model,
+                messages=messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                stream=True
+            )
+
+            for chunk in response:
+                yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            logger.error(f"Groq streaming error: {str(e)}")
+            raise
+
     def is_available(self) -> bool:
         """Check if Groq is available"""
         return bool(config.GROQ_API_KEY or self.config.api_key)
@@ -96,6 +125,28 @@ class OpenAIProvider(BaseLLMProvider):
             logger.error(f"OpenAI generation error: {str(e)}")
             raise
 
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks from OpenAI"""
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            response = self.client.chat.completions.create(
+                model=self.config.model,
+                messages=messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                stream=True
+            )
+
+            for chunk in response:
+                yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {str(e)}")
+            raise
+
     def is_available(self) -> bool:
         """Check if OpenAI is available"""
         return bool(config.OPENAI_API_KEY or self.config.api_key)
@@ -129,6 +180,24 @@ class ClaudeProvider(BaseLLMProvider):
             logger.error(f"Claude generation error: {str(e)}")
             raise
 
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks from Claude"""
+        try:
+            with self.client.messages.stream(
+                model=self.config.model,
+                max_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+                system=system_prompt or "",
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            logger.error(f"Claude streaming error: {str(e)}")
+            raise
+
     def is_available(self) -> bool:
         """Check if Claude is available"""
         return bool(config.ANTHROPIC_API_KEY or self.config.api_key)
@@ -142,18 +211,35 @@ class LLMFactory:
         "claude": ClaudeProvider
     }
 
+    # Providers cached per (provider, model, key) so repeated tasks reuse the
+    # SDK client's TLS connection pool instead of re-handshaking
+    _instance_cache: Dict[tuple, BaseLLMProvider] = {}
+    _cache_lock = threading.Lock()
+
     @classmethod
     def create_provider(cls, llm_config: LLMConfig) -> BaseLLMProvider:
-        """Create LLM provider instance"""
+        """Create (or reuse) an LLM provider instance"""
         provider_class = cls._providers.get(llm_config.provider.lower())
         if not provider_class:
             raise ValueError(f"Unknown provider: {llm_config.provider}")
 
-        return provider_class(llm_config)
+        key = (
+            llm_config.provider.lower(),
+            llm_config.model,
+            llm_config.temperature,
+            llm_config.max_tokens,
+            hashlib.sha256((llm_config.api_key or "").encode()).hexdigest()
+        )
+        with cls._cache_lock:
+            provider = cls._instance_cache.get(key)
+            if provider is None:
+                provider = cls._instance_cache[key] = provider_class(llm_config)
+            return provider
 
     @classmethod
+    @lru_cache(maxsize=1)
     def get_available_providers(cls) -> Dict[str, bool]:
-        """Get availability status of all providers"""
+        """Get availability status of all providers (memoized; keys are fixed at startup)"""
         return {
             "groq": bool(config.GROQ_API_KEY),
             "openai": bool(config.OPENAI_API_KEY),
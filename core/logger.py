@@ -2,29 +2,133 @@
 Logging Configuration Module
 Production-grade logging with file and console handlers
 """
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
-import colorlog
 from .config import config
 
+# colorlog is cosmetic only; a missing install degrades to plain console
+# output instead of blocking startup
+try:
+    import colorlog
+except ImportError:
+    colorlog = None
+
+# Formatters are immutable; build them once at import
+if colorlog is not None:
+    _CONSOLE_FORMATTER = colorlog.ColoredFormatter(
+        '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        log_colors={
+            'DEBUG': 'cyan',
+            'INFO': 'green',
+            'WARNING': 'yellow',
+            'ERROR': 'red',
+            'CRITICAL': 'red,bg_white',
+        }
+    )
+else:
+    _CONSOLE_FORMATTER = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+_FILE_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# One-shot guard: re-imports and repeated LoggerManager construction must
+# not stack duplicate handlers or leak file descriptors
+_configured = False
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler with a large write buffer and periodic flush
+
+    The base StreamHandler flushes after every record, paying a syscall per
+    log call. This variant writes into a 64 KiB buffer and relies on a
+    daemon thread flushing every FLUSH_INTERVAL seconds; ERROR and worse
+    flush immediately so failures reach disk right away. fsync happens only
+    on close.
+    """
+
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False):
+        super().__init__(filename, mode=mode, encoding=encoding, delay=delay)
+        flusher = threading.Thread(
+            target=self._flush_loop, name="log-flusher", daemon=True
+        )
+        flusher.start()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode,
+                    buffering=65536, encoding=self.encoding)
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except ValueError:
+                # Stream closed during shutdown
+                return
+
+    def close(self):
+        try:
+            if self.stream:
+                self.flush()
+                os.fsync(self.stream.fileno())
+        except (OSError, ValueError):
+            pass
+        super().close()
+
 class LoggerManager:
     """Manages application logging"""
-    
+
     def __init__(self):
         self.loggers = {}
+        self._listener: Optional[logging.handlers.QueueListener] = None
         self.setup_logging()
+        # The listener thread dies across os.fork(); restart it in children
+        # so queued file-log records keep draining
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._respawn_listener)
+
+    def _respawn_listener(self):
+        if self._listener is not None:
+            self._listener.start()
     
-    def setup_logging(self):
-        """Setup logging configuration"""
+    def setup_logging(self, force: bool = False):
+        """Setup logging configuration (no-op once configured)"""
+        global _configured
+        if _configured and not force:
+            return
+        _configured = True
+
         # Ensure logs directory exists
         config.LOGS_DIR.mkdir(exist_ok=True)
         
         # Create log file with timestamp
         timestamp = datetime.now().strftime("%Y%m%d")
-        log_file = config.LOGS_DIR / f"bdd_generator_{timestamp}.log"
+        log_file = os.path.join(str(config.LOGS_DIR), f"bdd_generator_{timestamp}.log")
         
         # Root logger configuration
         root_logger = logging.getLogger()
@@ -33,32 +137,28 @@ class LoggerManager:
         # Remove existing handlers
         root_logger.handlers = []
         
-        # Console handler with colors
-        console_handler = colorlog.StreamHandler(sys.stdout)
+        # Console handler with colors (plain when colorlog is absent)
+        console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_formatter = colorlog.ColoredFormatter(
-            '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            log_colors={
-                'DEBUG': 'cyan',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'red,bg_white',
-            }
-        )
-        console_handler.setFormatter(console_formatter)
+        console_handler.setFormatter(_CONSOLE_FORMATTER)
         root_logger.addHandler(console_handler)
         
-        # File handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # File handler, decoupled from the callers through a queue: log
+        # calls only enqueue the record, while a listener thread owns the
+        # blocking file write so the asyncio loop never waits on disk I/O
+        file_handler = BufferedFileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        file_handler.setFormatter(_FILE_FORMATTER)
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        self._listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
         )
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        self._listener.start()
+        atexit.register(self._listener.stop)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        logging.captureWarnings(True)
     
     def get_logger(self, name: str) -> logging.Logger:
         """Get or create a logger instance"""
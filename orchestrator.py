@@ -3,11 +3,15 @@ LangGraph-based Test Generator Orchestrator
 Replaces manual orchestration with a state machine approach
 """
 import asyncio
+import contextvars
+import functools
+import logging
+import os
+import time
 from typing import Dict, Any, Optional, List, Annotated, TypedDict
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
-import operator
 
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -37,19 +41,128 @@ async def send_ws_update(task_id: int, update: Dict[str, Any]):
         try:
             await websocket_manager.send_update(task_id, update)
         except Exception as e:
-            logger.debug(f"WebSocket update failed: {str(e)}")
+            logger.debug("WebSocket update failed: %s", e)
+
+
+def _ws_payload(task_id: int, progress: Optional[int], step: Optional[str],
+                kind: str = 'status', status: str = 'running',
+                error: Optional[str] = None) -> Dict[str, Any]:
+    """Build the standard progress payload in one place
+
+    The connection manager coalesces and msgpack-encodes payloads itself,
+    so this stays a plain dict; centralizing it just removes the repeated
+    inline literals from the node functions.
+    """
+    payload = {'type': kind, 'task_id': task_id, 'status': status}
+    if progress is not None:
+        payload['progress'] = progress
+    if step is not None:
+        payload['current_step'] = step
+    if error is not None:
+        payload['error'] = error
+    return payload
+
+
+class ProgressReporter:
+    """Coalesces per-node progress ticks into batched DB writes and WS pushes
+
+    Each node used to pay a synchronous DB round-trip plus a WebSocket frame
+    for every status change. Nodes now enqueue (task_id, progress, step)
+    without blocking; a single drainer coroutine waits a short window, keeps
+    only the newest tick per task, then issues one off-loop DB update and one
+    WS frame per task. Terminal states (completed/failed) bypass the reporter
+    so they are durable before the workflow returns.
+    """
+
+    COALESCE_WINDOW = 0.02  # seconds
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+
+    def report(self, task_id: int, progress: int, step: str):
+        """Enqueue a progress tick; the drainer starts lazily on first use"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.get_running_loop().create_task(self._drain())
+        self._queue.put_nowait((task_id, progress, step))
+
+    async def _drain(self):
+        while True:
+            task_id, progress, step = await self._queue.get()
+            latest = {task_id: (progress, step)}
+            await asyncio.sleep(self.COALESCE_WINDOW)
+            while not self._queue.empty():
+                task_id, progress, step = self._queue.get_nowait()
+                latest[task_id] = (progress, step)
+            for task_id, (progress, step) in latest.items():
+                try:
+                    await asyncio.to_thread(
+                        db.update_task_status, task_id, 'running',
+                        progress=progress, current_step=step
+                    )
+                    await send_ws_update(
+                        task_id, _ws_payload(task_id, progress, step)
+                    )
+                except Exception as e:
+                    logger.debug("Progress update failed: %s", e)
+
+
+progress_reporter = ProgressReporter()
+
+
+def _report_progress(task_id: int, progress: int, step: str):
+    """Fire-and-forget progress tick for the running task"""
+    progress_reporter.report(task_id, progress, step)
+
+
+class _RunContext:
+    """Per-run carrier for the constructed LLM config and Gherkin generator
+
+    generate_tests constructs the config once and parks it here on a
+    ContextVar so nodes don't rebuild it per step; the generator is built
+    lazily on first use so provider errors still surface inside a node's
+    try block.
+    """
+
+    __slots__ = ("llm_config", "_generator")
+
+    def __init__(self, llm_config: LLMConfig):
+        self.llm_config = llm_config
+        self._generator = None
+
+    @property
+    def gherkin_generator(self):
+        if self._generator is None:
+            self._generator = create_gherkin_generator(self.llm_config)
+        return self._generator
+
+
+_run_context: contextvars.ContextVar[Optional[_RunContext]] = \
+    contextvars.ContextVar("run_context", default=None)
 
 
 # ============================================================================
 # STATE DEFINITION
 # ============================================================================
 
+def _append_logs(left: List[str], right: List[str]) -> List[str]:
+    """Reducer for WorkflowState.logs
+
+    operator.add re-concatenates (and copies) the whole accumulator on
+    every node return; extending in place keeps each merge O(len(right)).
+    """
+    left.extend(right)
+    return left
+
+
 class WorkflowState(TypedDict):
     """State schema for the LangGraph workflow"""
     # Input parameters
     url: str
-    llm_config: dict
-    browser_config: dict
+    llm_config: LLMConfig
+    browser_config: BrowserConfig
 
     # Task tracking
     task_id: Optional[int]
@@ -73,340 +186,250 @@ class WorkflowState(TypedDict):
     # Final result
     result: Optional[Dict[str, Any]]
 
+    # Timestamp shared by all artifacts of this run (set by create_task_node)
+    timestamp: Optional[str]
+
     # Logs for debugging
-    logs: Annotated[List[str], operator.add]
+    logs: Annotated[List[str], _append_logs]
 
 
 # ============================================================================
 # NODE FUNCTIONS
 # ============================================================================
 
+def _error_routed(name: str):
+    """Route any node exception into the failed-state dict
+
+    Every node used to carry the same try/except boilerplate; this wraps
+    the happy path instead. The traceback is attached to the log record
+    only when DEBUG is enabled, and the error is recorded against the task
+    when one exists.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(state: WorkflowState) -> Dict[str, Any]:
+            try:
+                return await fn(state)
+            except Exception as e:
+                error_msg = f"{name} failed: {e!s}"
+                logger.error(error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
+                task_id = state.get("task_id")
+                if task_id:
+                    db.add_log(task_id, 'ERROR', error_msg)
+                return {
+                    "status": "failed",
+                    "error_message": error_msg,
+                    "logs": [error_msg]
+                }
+        return wrapper
+    return decorator
+
+
+@_error_routed("Task creation")
 async def create_task_node(state: WorkflowState) -> Dict[str, Any]:
     """Node: Create task in database"""
-    try:
-        url = state["url"]
-        llm_config = LLMConfig(**state["llm_config"])
-
-        task_id = db.create_task(url, llm_config.provider, llm_config.model)
-        logger.info(f"Created task {task_id} for URL: {url}")
-
-        db.update_task_status(task_id, 'running', progress=0, current_step='Initializing')
-        db.add_log(task_id, 'INFO', f'Starting test generation for {url}')
-
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 0,
-            'current_step': 'Initializing browser'
-        })
-
-        return {
-            "task_id": task_id,
-            "status": "running",
-            "progress": 5,
-            "current_step": "Task created",
-            "logs": [f"Task {task_id} created for {url}"]
-        }
+    url = state["url"]
+    ctx = _run_context.get()
+    llm_config = ctx.llm_config if ctx else state["llm_config"]
 
-    except Exception as e:
-        error_msg = f"Failed to create task: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    task_id = await asyncio.to_thread(
+        db.create_task, url, llm_config.provider, llm_config.model
+    )
+    logger.info("Created task %s for URL: %s", task_id, url)
 
+    await asyncio.to_thread(
+        db.update_task_status, task_id, 'running',
+        progress=0, current_step='Initializing'
+    )
+    db.add_log(task_id, 'INFO', f'Starting test generation for {url}')
 
+    await send_ws_update(
+        task_id, _ws_payload(task_id, 0, 'Initializing browser')
+    )
+
+    return {
+        "task_id": task_id,
+        "status": "running",
+        "progress": 5,
+        "current_step": "Task created",
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "logs": [f"Task {task_id} created for {url}"]
+    }
+
+
+@_error_routed("URL load")
 async def navigate_to_url_node(state: WorkflowState) -> Dict[str, Any]:
     """Node: Navigate browser to URL"""
     task_id = state["task_id"]
     url = state["url"]
 
-    try:
-        db.update_task_status(task_id, 'running', progress=15, current_step='Loading webpage')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 15,
-            'current_step': f'Loading {url}'
-        })
-
-        db.add_log(task_id, 'INFO', f'Navigating to {url}')
-
-        return {
-            "progress": 20,
-            "current_step": "Page loaded",
-            "browser_initialized": True,
-            "logs": [f"Successfully loaded {url}"]
-        }
+    _report_progress(task_id, 15, f'Loading {url}')
 
-    except Exception as e:
-        error_msg = f"Failed to load URL: {str(e)}"
-        logger.error(error_msg)
-        db.add_log(task_id, 'ERROR', error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    db.add_log(task_id, 'INFO', f'Navigating to {url}')
+
+    return {
+        "progress": 20,
+        "current_step": "Page loaded",
+        "browser_initialized": True,
+        "logs": [f"Successfully loaded {url}"]
+    }
 
 
+@_error_routed("Page structure analysis")
 async def analyze_page_structure_node(state: WorkflowState) -> Dict[str, Any]:
     """Node: Analyze page structure"""
     task_id = state["task_id"]
 
-    try:
-        db.update_task_status(task_id, 'running', progress=25, current_step='Analyzing page structure')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 25,
-            'current_step': 'Analyzing page structure'
-        })
-
-        # Page structure will be set by the browser context manager
-        return {
-            "progress": 30,
-            "current_step": "Page structure analyzed",
-            "logs": ["Page structure analysis complete"]
-        }
+    _report_progress(task_id, 25, 'Analyzing page structure')
 
-    except Exception as e:
-        error_msg = f"Page structure analysis failed: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    # Page structure will be set by the browser context manager
+    return {
+        "progress": 30,
+        "current_step": "Page structure analyzed",
+        "logs": ["Page structure analysis complete"]
+    }
 
 
+@_error_routed("Hover element detection")
 async def analyze_hover_elements_node(state: WorkflowState) -> Dict[str, Any]:
     """Node: Detect and analyze hover elements"""
     task_id = state["task_id"]
 
-    try:
-        db.update_task_status(task_id, 'running', progress=40, current_step='Detecting hover elements')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 40,
-            'current_step': 'Detecting hover elements'
-        })
-
-        # Hover elements will be set by the browser context manager
-        return {
-            "progress": 50,
-            "current_step": "Hover elements detected",
-            "logs": ["Hover element detection complete"]
-        }
+    _report_progress(task_id, 40, 'Detecting hover elements')
 
-    except Exception as e:
-        error_msg = f"Hover element detection failed: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    # Hover elements will be set by the browser context manager
+    return {
+        "progress": 50,
+        "current_step": "Hover elements detected",
+        "logs": ["Hover element detection complete"]
+    }
 
 
+@_error_routed("Popup element detection")
 async def analyze_popup_elements_node(state: WorkflowState) -> Dict[str, Any]:
     """Node: Detect and analyze popup elements"""
     task_id = state["task_id"]
 
-    try:
-        db.update_task_status(task_id, 'running', progress=55, current_step='Detecting popup elements')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 55,
-            'current_step': 'Detecting popup/modal elements'
-        })
-
-        # Popup elements will be set by the browser context manager
-        return {
-            "progress": 65,
-            "current_step": "Popup elements detected",
-            "logs": ["Popup element detection complete"]
-        }
-
-    except Exception as e:
-        error_msg = f"Popup element detection failed: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
-
-
-async def generate_hover_features_node(state: WorkflowState) -> Dict[str, Any]:
-    """Node: Generate Gherkin features for hover elements"""
-    task_id = state["task_id"]
-    url = state["url"]
-    llm_config = LLMConfig(**state["llm_config"])
-    hover_elements = state.get("hover_elements", [])
-    page_structure = state.get("page_structure", {})
-
-    try:
-        db.update_task_status(task_id, 'running', progress=70, current_step='Generating hover test scenarios')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 70,
-            'current_step': 'Generating hover test scenarios'
-        })
-
-        gherkin_generator = create_gherkin_generator(llm_config)
-        hover_features_content = gherkin_generator.generate_hover_features(
-            url, hover_elements, page_structure
-        )
-
-        # Save feature file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        hover_filename = f"hover_tests_{timestamp}.feature"
-        hover_filepath = gherkin_generator.save_feature_file(hover_features_content, hover_filename)
-
-        db.save_feature(task_id, 'hover', hover_features_content, str(hover_filepath))
-        db.add_log(task_id, 'INFO', f'Generated hover features: {hover_filename}')
+    _report_progress(task_id, 55, 'Detecting popup/modal elements')
 
-        hover_features = {
-            'content': hover_features_content,
-            'file': hover_filename,
-            'path': str(hover_filepath)
-        }
-
-        return {
-            "hover_features": hover_features,
-            "progress": 80,
-            "current_step": "Hover features generated",
-            "logs": [f"Generated hover features: {hover_filename}"]
-        }
+    # Popup elements will be set by the browser context manager
+    return {
+        "progress": 65,
+        "current_step": "Popup elements detected",
+        "logs": ["Popup element detection complete"]
+    }
 
-    except Exception as e:
-        error_msg = f"Hover feature generation failed: {str(e)}"
-        logger.error(error_msg)
-        db.add_log(task_id, 'ERROR', error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
 
+@_error_routed("Feature generation")
+async def generate_features_node(state: WorkflowState) -> Dict[str, Any]:
+    """Node: Generate hover and popup Gherkin features concurrently
 
-async def generate_popup_features_node(state: WorkflowState) -> Dict[str, Any]:
-    """Node: Generate Gherkin features for popup elements"""
+    Both generations are independent LLM calls over the same captured
+    analysis, so they run on worker threads and overlap; the stage takes
+    the latency of the slower call instead of the sum of both.
+    """
     task_id = state["task_id"]
     url = state["url"]
-    llm_config = LLMConfig(**state["llm_config"])
+    hover_elements = state.get("hover_elements", [])
     popup_elements = state.get("popup_elements", [])
     page_structure = state.get("page_structure", {})
 
-    try:
-        db.update_task_status(task_id, 'running', progress=85, current_step='Generating popup test scenarios')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 85,
-            'current_step': 'Generating popup test scenarios'
-        })
-
-        gherkin_generator = create_gherkin_generator(llm_config)
-        popup_features_content = gherkin_generator.generate_popup_features(
-            url, popup_elements, page_structure
-        )
+    _report_progress(task_id, 70, 'Generating test scenarios')
 
-        # Save feature file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        popup_filename = f"popup_tests_{timestamp}.feature"
-        popup_filepath = gherkin_generator.save_feature_file(popup_features_content, popup_filename)
+    ctx = _run_context.get()
+    gherkin_generator = (ctx.gherkin_generator if ctx
+                         else create_gherkin_generator(state["llm_config"]))
 
-        db.save_feature(task_id, 'popup', popup_features_content, str(popup_filepath))
-        db.add_log(task_id, 'INFO', f'Generated popup features: {popup_filename}')
+    hover_content, popup_content = await asyncio.gather(
+        asyncio.to_thread(gherkin_generator.generate_hover_features,
+                          url, hover_elements, page_structure),
+        asyncio.to_thread(gherkin_generator.generate_popup_features,
+                          url, popup_elements, page_structure)
+    )
 
-        popup_features = {
-            'content': popup_features_content,
-            'file': popup_filename,
-            'path': str(popup_filepath)
-        }
+    # Save feature files, named with the run-wide timestamp
+    timestamp = state.get("timestamp") or datetime.now().strftime("%Y%m%d_%H%M%S")
+    hover_filename = f"hover_tests_{timestamp}.feature"
+    popup_filename = f"popup_tests_{timestamp}.feature"
+    hover_filepath, popup_filepath = await asyncio.gather(
+        asyncio.to_thread(gherkin_generator.save_feature_file,
+                          hover_content, hover_filename),
+        asyncio.to_thread(gherkin_generator.save_feature_file,
+                          popup_content, popup_filename)
+    )
 
-        return {
-            "popup_features": popup_features,
-            "progress": 95,
-            "current_step": "Popup features generated",
-            "logs": [f"Generated popup features: {popup_filename}"]
-        }
+    hover_path = os.fspath(hover_filepath)
+    popup_path = os.fspath(popup_filepath)
+    await asyncio.gather(
+        asyncio.to_thread(db.save_feature, task_id, 'hover',
+                          hover_content, hover_path),
+        asyncio.to_thread(db.save_feature, task_id, 'popup',
+                          popup_content, popup_path)
+    )
+    # Two entries, not one: /api/workflow infers step completion from the
+    # 'hover features' / 'popup features' substrings in the execution log
+    db.add_log(task_id, 'INFO', f'Generated hover features: {hover_filename}')
+    db.add_log(task_id, 'INFO', f'Generated popup features: {popup_filename}')
 
-    except Exception as e:
-        error_msg = f"Popup feature generation failed: {str(e)}"
-        logger.error(error_msg)
-        db.add_log(task_id, 'ERROR', error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    return {
+        "hover_features": {
+            'content': hover_content,
+            'file': hover_filename,
+            'path': hover_path
+        },
+        "popup_features": {
+            'content': popup_content,
+            'file': popup_filename,
+            'path': popup_path
+        },
+        "progress": 95,
+        "current_step": "Features generated",
+        "logs": [f"Generated hover features: {hover_filename}",
+                 f"Generated popup features: {popup_filename}"]
+    }
 
 
+@_error_routed("Task completion")
 async def complete_task_node(state: WorkflowState) -> Dict[str, Any]:
     """Node: Finalize task and compile results"""
     task_id = state["task_id"]
     url = state["url"]
 
-    try:
-        db.update_task_status(task_id, 'completed', progress=100, current_step='Test generation completed')
-        db.add_log(task_id, 'INFO', 'Test generation completed successfully')
-
-        await send_ws_update(task_id, {
-            'type': 'complete',
-            'task_id': task_id,
-            'status': 'completed',
-            'progress': 100,
-            'current_step': 'Test generation completed'
-        })
-
-        result = {
-            'task_id': task_id,
-            'status': 'completed',
-            'url': url,
-            'features': {
-                'hover': state.get("hover_features"),
-                'popup': state.get("popup_features")
-            },
-            'analysis': {
-                'hover_elements': state.get("hover_elements", []),
-                'popup_elements': state.get("popup_elements", []),
-                'page_structure': state.get("page_structure", {})
-            }
-        }
+    await asyncio.to_thread(
+        db.update_task_status, task_id, 'completed',
+        progress=100, current_step='Test generation completed'
+    )
+    db.add_log(task_id, 'INFO', 'Test generation completed successfully')
 
-        logger.info(f"Task {task_id} completed successfully")
+    await send_ws_update(
+        task_id, _ws_payload(task_id, 100, 'Test generation completed',
+                             kind='complete', status='completed')
+    )
 
-        return {
-            "status": "completed",
-            "progress": 100,
-            "current_step": "Test generation completed",
-            "result": result,
-            "logs": [f"Task {task_id} completed successfully"]
+    result = {
+        'task_id': task_id,
+        'status': 'completed',
+        'url': url,
+        'features': {
+            'hover': state.get("hover_features"),
+            'popup': state.get("popup_features")
+        },
+        'analysis': {
+            'hover_elements': state.get("hover_elements", []),
+            'popup_elements': state.get("popup_elements", []),
+            'page_structure': state.get("page_structure", {})
         }
+    }
 
-    except Exception as e:
-        error_msg = f"Task completion failed: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    logger.info("Task %s completed successfully", task_id)
+
+    return {
+        "status": "completed",
+        "progress": 100,
+        "current_step": "Test generation completed",
+        "result": result,
+        "logs": [f"Task {task_id} completed successfully"]
+    }
 
 
 async def handle_error_node(state: WorkflowState) -> Dict[str, Any]:
@@ -415,15 +438,15 @@ async def handle_error_node(state: WorkflowState) -> Dict[str, Any]:
     error_message = state.get("error_message", "Unknown error")
 
     if task_id:
-        db.update_task_status(task_id, 'failed', error_message=error_message)
+        await asyncio.to_thread(
+            db.update_task_status, task_id, 'failed', error_message=error_message
+        )
         db.add_log(task_id, 'ERROR', error_message)
 
-        await send_ws_update(task_id, {
-            'type': 'error',
-            'task_id': task_id,
-            'status': 'failed',
-            'error': error_message
-        })
+        await send_ws_update(
+            task_id, _ws_payload(task_id, None, None,
+                                 kind='error', status='failed', error=error_message)
+        )
 
     logger.error(f"Workflow failed: {error_message}")
 
@@ -437,32 +460,14 @@ async def handle_error_node(state: WorkflowState) -> Dict[str, Any]:
 # CONDITIONAL EDGES
 # ============================================================================
 
-def should_continue(state: WorkflowState) -> str:
-    """Determine if workflow should continue or handle error"""
-    if state.get("status") == "failed":
-        return "handle_error"
-    return "continue"
-
-
-def after_create_task(state: WorkflowState) -> str:
-    """Router after task creation"""
-    if state.get("status") == "failed":
-        return "handle_error"
-    return "browser_analysis"
-
-
-def after_browser_analysis(state: WorkflowState) -> str:
-    """Router after browser analysis"""
-    if state.get("status") == "failed":
-        return "handle_error"
-    return "generate_features"
+def _route(state: WorkflowState, ok_dest: str) -> str:
+    """Generic conditional-edge router: error state or the happy path"""
+    return "handle_error" if state.get("status") == "failed" else ok_dest
 
 
-def after_feature_generation(state: WorkflowState) -> str:
-    """Router after feature generation"""
-    if state.get("status") == "failed":
-        return "handle_error"
-    return "complete"
+after_create_task = functools.partial(_route, ok_dest="browser_analysis")
+after_browser_analysis = functools.partial(_route, ok_dest="generate_features")
+after_feature_generation = functools.partial(_route, ok_dest="complete")
 
 
 # ============================================================================
@@ -478,8 +483,7 @@ def build_workflow() -> StateGraph:
     # Add nodes
     workflow.add_node("create_task", create_task_node)
     workflow.add_node("browser_analysis", browser_analysis_subgraph)
-    workflow.add_node("generate_hover_features", generate_hover_features_node)
-    workflow.add_node("generate_popup_features", generate_popup_features_node)
+    workflow.add_node("generate_features", generate_features_node)
     workflow.add_node("complete_task", complete_task_node)
     workflow.add_node("handle_error", handle_error_node)
 
@@ -500,15 +504,13 @@ def build_workflow() -> StateGraph:
         "browser_analysis",
         after_browser_analysis,
         {
-            "generate_features": "generate_hover_features",
+            "generate_features": "generate_features",
             "handle_error": "handle_error"
         }
     )
 
-    workflow.add_edge("generate_hover_features", "generate_popup_features")
-
     workflow.add_conditional_edges(
-        "generate_popup_features",
+        "generate_features",
         after_feature_generation,
         {
             "complete": "complete_task",
@@ -523,6 +525,7 @@ def build_workflow() -> StateGraph:
     return workflow
 
 
+@_error_routed("Browser analysis")
 async def browser_analysis_subgraph(state: WorkflowState) -> Dict[str, Any]:
     """
     Combined browser analysis node that handles the browser lifecycle
@@ -530,101 +533,59 @@ async def browser_analysis_subgraph(state: WorkflowState) -> Dict[str, Any]:
     """
     task_id = state["task_id"]
     url = state["url"]
-    browser_config = BrowserConfig(**state["browser_config"])
-
-    try:
-        # Update: Launching browser
-        db.update_task_status(task_id, 'running', progress=10, current_step='Launching browser')
-        await send_ws_update(task_id, {
-            'type': 'status',
-            'task_id': task_id,
-            'status': 'running',
-            'progress': 10,
-            'current_step': 'Launching browser'
-        })
-
-        async with BrowserAutomation(browser_config) as browser:
-            # Navigate to URL
-            db.update_task_status(task_id, 'running', progress=20, current_step=f'Loading {url}')
-            await send_ws_update(task_id, {
-                'type': 'status',
-                'task_id': task_id,
-                'status': 'running',
-                'progress': 20,
-                'current_step': f'Loading {url}'
-            })
-
-            if not await browser.navigate_to_url(url):
-                raise Exception(f"Failed to load URL: {url}")
-
-            db.add_log(task_id, 'INFO', f'Successfully loaded {url}')
-
-            # Analyze page structure
-            db.update_task_status(task_id, 'running', progress=30, current_step='Analyzing page structure')
-            await send_ws_update(task_id, {
-                'type': 'status',
-                'task_id': task_id,
-                'status': 'running',
-                'progress': 30,
-                'current_step': 'Analyzing page structure'
-            })
-
-            page_structure = await browser.get_page_structure()
-            db.add_log(task_id, 'INFO', f'Page structure analyzed: {page_structure.get("title", "Unknown")}')
-
-            # Analyze hover elements
-            db.update_task_status(task_id, 'running', progress=40, current_step='Detecting hover elements')
-            await send_ws_update(task_id, {
-                'type': 'status',
-                'task_id': task_id,
-                'status': 'running',
-                'progress': 40,
-                'current_step': 'Detecting hover elements'
-            })
-
-            hover_elements = await browser.analyze_hover_elements()
-            db.add_log(task_id, 'INFO', f'Found {len(hover_elements)} hover elements',
-                      {'count': len(hover_elements)})
-
-            # Analyze popup elements
-            db.update_task_status(task_id, 'running', progress=60, current_step='Detecting popup/modal elements')
-            await send_ws_update(task_id, {
-                'type': 'status',
-                'task_id': task_id,
-                'status': 'running',
-                'progress': 60,
-                'current_step': 'Detecting popup/modal elements'
-            })
-
-            popup_elements = await browser.analyze_popup_elements()
-            db.add_log(task_id, 'INFO', f'Found {len(popup_elements)} popup elements',
-                      {'count': len(popup_elements)})
-
-        # Save analysis to database
-        db.save_dom_analysis(task_id, hover_elements, popup_elements, page_structure)
-
-        return {
-            "page_structure": page_structure,
-            "hover_elements": hover_elements,
-            "popup_elements": popup_elements,
-            "browser_initialized": True,
-            "progress": 65,
-            "current_step": "Browser analysis complete",
-            "logs": [
-                f"Page structure analyzed: {page_structure.get('title', 'Unknown')}",
-                f"Found {len(hover_elements)} hover elements",
-                f"Found {len(popup_elements)} popup elements"
-            ]
-        }
+    browser_config = state["browser_config"]
 
-    except Exception as e:
-        error_msg = f"Browser analysis error: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "status": "failed",
-            "error_message": error_msg,
-            "logs": [error_msg]
-        }
+    # Update: Launching browser
+    _report_progress(task_id, 10, 'Launching browser')
+
+    async with BrowserAutomation(browser_config) as browser:
+        # Navigate to URL
+        _report_progress(task_id, 20, f'Loading {url}')
+
+        if not await browser.navigate_to_url(url):
+            raise Exception(f"Failed to load URL: {url}")
+
+        db.add_log(task_id, 'INFO', f'Successfully loaded {url}')
+
+        # Analyze page structure
+        _report_progress(task_id, 30, 'Analyzing page structure')
+
+        page_structure = await browser.get_page_structure()
+        db.add_log(task_id, 'INFO', f'Page structure analyzed: {page_structure.get("title", "Unknown")}')
+
+        # Analyze hover and popup elements concurrently: both are DOM
+        # scans over the same loaded page whose probes run in their own
+        # browser contexts, so the two analyses overlap cleanly
+        _report_progress(task_id, 40, 'Detecting hover and popup elements')
+
+        hover_elements, popup_elements = await asyncio.gather(
+            browser.analyze_hover_elements(),
+            browser.analyze_popup_elements()
+        )
+        _report_progress(task_id, 60, 'Element detection complete')
+        db.add_log(task_id, 'INFO', f'Found {len(hover_elements)} hover elements',
+                  {'count': len(hover_elements)})
+        db.add_log(task_id, 'INFO', f'Found {len(popup_elements)} popup elements',
+                  {'count': len(popup_elements)})
+
+    # Save analysis to database (off the event loop)
+    await asyncio.to_thread(
+        db.save_dom_analysis, task_id, hover_elements, popup_elements, page_structure
+    )
+
+    return {
+        "page_structure": page_structure,
+        "hover_elements": hover_elements,
+        "popup_elements": popup_elements,
+        "browser_initialized": True,
+        "progress": 65,
+        "current_step": "Browser analysis complete",
+        "logs": [
+            f"Page structure analyzed: {page_structure.get('title', 'Unknown')}",
+            f"Found {len(hover_elements)} hover elements",
+            f"Found {len(popup_elements)} popup elements"
+        ]
+    }
 
 
 # ============================================================================
@@ -632,7 +593,12 @@ async def browser_analysis_subgraph(state: WorkflowState) -> Dict[str, Any]:
 # ============================================================================
 
 class TestGeneratorOrchestrator:
-    """LangGraph-based orchestrator for test generation pipeline"""
+    """LangGraph-based orchestrator for test generation pipeline
+
+    The compiled StateGraph is stateless across runs, so a single instance can
+    be shared by all tasks (see build_shared); per-task configuration travels
+    through the workflow state rather than the constructor.
+    """
 
     def __init__(self, llm_config: LLMConfig, browser_config: Optional[BrowserConfig] = None):
         self.llm_config = llm_config
@@ -641,22 +607,42 @@ class TestGeneratorOrchestrator:
         self.app = self.workflow.compile()
         self.task_id: Optional[int] = None
 
-    async def generate_tests(self, url: str) -> Dict[str, Any]:
+    @classmethod
+    def build_shared(cls) -> "TestGeneratorOrchestrator":
+        """Build a shared orchestrator, compiling the StateGraph once at startup"""
+        return cls(LLMConfig(), BrowserConfig())
+
+    async def generate_tests(self, url: str,
+                             llm_config: Optional[LLMConfig] = None,
+                             browser_config: Optional[BrowserConfig] = None) -> Dict[str, Any]:
         """
         Run the test generation workflow
 
         Args:
             url: Website URL to analyze
+            llm_config: Per-task LLM configuration (defaults to the instance config)
+            browser_config: Per-task browser configuration (defaults to the instance config)
 
         Returns:
             Dictionary with task results
         """
+        llm_config = llm_config or self.llm_config
+        browser_config = browser_config or self.browser_config
+
+        # Construct the LLM context once per run; nodes read it off the
+        # ContextVar instead of rebuilding config/generator from state
+        _run_context.set(_RunContext(llm_config))
+
+        # Track the task id locally so concurrent runs on a shared
+        # orchestrator don't clobber each other
+        task_id: Optional[int] = None
+
         try:
             # Initialize state
             initial_state: WorkflowState = {
                 "url": url,
-                "llm_config": self.llm_config.model_dump(),
-                "browser_config": self.browser_config.model_dump(),
+                "llm_config": llm_config,
+                "browser_config": browser_config,
                 "task_id": None,
                 "status": "pending",
                 "progress": 0,
@@ -669,11 +655,12 @@ class TestGeneratorOrchestrator:
                 "hover_features": None,
                 "popup_features": None,
                 "result": None,
+                "timestamp": None,
                 "logs": []
             }
 
             # Run the workflow
-            config = {"configurable": {"thread_id": f"task_{datetime.now().timestamp()}"}}
+            config = {"configurable": {"thread_id": f"task_{time.monotonic_ns()}"}}
 
             final_state = None
             async for event in self.app.astream(initial_state, config):
@@ -683,10 +670,10 @@ class TestGeneratorOrchestrator:
                         final_state = node_state
                         # Update task_id reference
                         if node_state.get("task_id"):
-                            self.task_id = node_state["task_id"]
+                            task_id = node_state["task_id"]
 
                         # Log progress
-                        logger.debug(f"Node '{node_name}' completed. Progress: {node_state.get('progress', 0)}%")
+                        logger.debug("Node '%s' completed. Progress: %s%%", node_name, node_state.get('progress', 0))
 
             # Return the result
             if final_state and final_state.get("result"):
@@ -700,16 +687,16 @@ class TestGeneratorOrchestrator:
             error_msg = f"Error in test generation: {str(e)}"
             logger.error(error_msg)
 
-            if self.task_id:
-                db.update_task_status(self.task_id, 'failed', error_message=error_msg)
-                db.add_log(self.task_id, 'ERROR', error_msg)
+            if task_id:
+                await asyncio.to_thread(
+                    db.update_task_status, task_id, 'failed', error_message=error_msg
+                )
+                db.add_log(task_id, 'ERROR', error_msg)
 
-                await send_ws_update(self.task_id, {
-                    'type': 'error',
-                    'task_id': self.task_id,
-                    'status': 'failed',
-                    'error': error_msg
-                })
+                await send_ws_update(
+                    task_id, _ws_payload(task_id, None, None,
+                                         kind='error', status='failed', error=error_msg)
+                )
 
             raise
 
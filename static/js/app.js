@@ -83,9 +83,10 @@ class BDDTestGenerator {
             this.websocket.close();
         }
 
-        // WebSocket URL
+        // WebSocket URL; the server speaks MessagePack by default, so opt
+        // into JSON frames, which the browser can parse natively
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const wsUrl = `${protocol}//${window.location.host}/ws/${taskId}`;
+        const wsUrl = `${protocol}//${window.location.host}/ws/${taskId}?format=json`;
         
         this.websocket = new WebSocket(wsUrl);
 
@@ -96,8 +97,10 @@ class BDDTestGenerator {
         };
 
         this.websocket.onmessage = (event) => {
-            const message = JSON.parse(event.data);
-            this.handleWebSocketMessage(message);
+            // The server coalesces updates, so each frame carries a batch
+            // of messages in emit order
+            const batch = JSON.parse(event.data);
+            batch.forEach(message => this.handleWebSocketMessage(message));
         };
 
         this.websocket.onerror = (error) => {